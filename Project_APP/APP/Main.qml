@@ -437,6 +437,77 @@ Connections {
                         }
                     }
 
+                    // Search box: full-text search over projects, tasks, messages and events
+                    TextField {
+                        id: searchField
+                        width: parent.width - 32
+                        x: 16
+                        height: 36
+                        placeholderText: "Search..."
+                        selectByMouse: true
+                        onTextChanged: searchDebounce.restart()
+                        Timer {
+                            id: searchDebounce
+                            interval: 250
+                            onTriggered: {
+                                if (searchField.text.trim().length > 0 && AuthManager.userId > 0)
+                                    searchManager.search(AuthManager.userId, searchField.text)
+                                else
+                                    searchManager.clear()
+                            }
+                        }
+                    }
+                    Column {
+                        id: searchResultsColumn
+                        width: parent.width
+                        spacing: 2
+                        visible: searchField.text.trim().length > 0
+                        Repeater {
+                            model: searchManager ? searchManager.results : []
+                            Rectangle {
+                                width: parent.width
+                                height: 40
+                                color: "#eef3fb"
+                                radius: 6
+                                MouseArea {
+                                    anchors.fill: parent
+                                    cursorShape: Qt.PointingHandCursor
+                                    enabled: !!modelData.project_id
+                                    onClicked: {
+                                        root.selectedProjectId = modelData.project_id
+                                        root.currentPage = "projectDetails"
+                                        searchField.text = ""
+                                    }
+                                }
+                                Column {
+                                    x: 8
+                                    width: parent.width - 16
+                                    Text {
+                                        text: modelData.kind + ": " + modelData.title
+                                        font.pixelSize: 14
+                                        color: "#2255aa"
+                                        elide: Text.ElideRight
+                                        width: parent.width
+                                    }
+                                    Text {
+                                        text: modelData.snippet
+                                        font.pixelSize: 12
+                                        color: "#555"
+                                        elide: Text.ElideRight
+                                        width: parent.width
+                                    }
+                                }
+                            }
+                        }
+                        Text {
+                            visible: searchManager && searchManager.results.length === 0
+                            text: "No results"
+                            font.pixelSize: 13
+                            color: "#777"
+                            leftPadding: 16
+                        }
+                    }
+
                     // Project list below heading (dynamic, selectable)
                     ScrollView {
                         id: projectListScroll
@@ -592,6 +663,56 @@ Connections {
                         color: "#000"
                     }
                 }
+
+                // Assistant box: LLM output is rendered token by token as it streams in
+                Column {
+                    id: assistantBox
+                    x: 55
+                    y: 790
+                    width: 900
+                    spacing: 6
+
+                    Row {
+                        spacing: 8
+                        TextField {
+                            id: assistantPrompt
+                            width: 700
+                            placeholderText: "Ask the assistant..."
+                            onAccepted: assistantAskButton.clicked()
+                        }
+                        Button {
+                            id: assistantAskButton
+                            text: "Ask"
+                            enabled: typeof llmStream !== "undefined" && !llmStream.busy && assistantPrompt.text.length > 0
+                            onClicked: llmStream.startStream("tinyllama:1.1b", assistantPrompt.text)
+                        }
+                        Button {
+                            text: "Stop"
+                            enabled: typeof llmStream !== "undefined" && llmStream.busy
+                            onClicked: llmStream.cancel()
+                        }
+                    }
+
+                    Text {
+                        visible: loadingManager ? !loadingManager.modelsReady : false
+                        font.pixelSize: 12
+                        color: "#888"
+                        text: loadingManager ? "Warming up models - " + loadingManager.modelStatus : ""
+                    }
+
+                    ScrollView {
+                        width: 900
+                        height: 52
+                        clip: true
+                        Text {
+                            width: 880
+                            wrapMode: Text.Wrap
+                            font.pixelSize: 14
+                            color: "#333"
+                            text: typeof llmStream !== "undefined" ? llmStream.text : ""
+                        }
+                    }
+                }
             }
         }
     }
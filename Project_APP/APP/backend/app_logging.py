@@ -0,0 +1,244 @@
+# app_logging.py
+# One logging subsystem for the app.
+# Callers only format an entry and put it on a queue; a background thread writes JSON lines in
+# batches to a single open file, rotating it by size and age. The most recent entries are also
+# kept in an in-memory ring buffer so the UI can show them without reading the log from disk.
+
+import collections
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# --------------------------
+# Configuration
+# --------------------------
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LOG_PATH = os.getenv("APP_LOG_PATH", os.path.join(APP_DIR, "app_log.jsonl"))
+DEFAULT_MAX_BYTES = int(os.getenv("APP_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+DEFAULT_ROTATE_INTERVAL = float(os.getenv("APP_LOG_ROTATE_INTERVAL", str(24 * 3600)))  # seconds
+DEFAULT_BACKUPS = int(os.getenv("APP_LOG_BACKUPS", "5"))
+DEFAULT_RING_SIZE = 500
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+DEFAULT_LEVEL = os.getenv("APP_LOG_LEVEL", "INFO").upper()
+
+
+def _parse_levels(spec):
+    """Parse "auth=DEBUG,db=WARNING" into {component: level number}."""
+    levels = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            component, level = part.split("=", 1)
+            if level.strip().upper() in LEVELS:
+                levels[component.strip()] = LEVELS[level.strip().upper()]
+    return levels
+
+
+# Per-component overrides, e.g. APP_LOG_LEVELS="auth=DEBUG,llm=WARNING"
+_component_levels = _parse_levels(os.getenv("APP_LOG_LEVELS"))
+
+
+def set_level(component, level):
+    """Change the minimum level logged for `component` at runtime."""
+    _component_levels[component] = LEVELS[level.upper()]
+
+
+def is_enabled(component, level):
+    return LEVELS[level] >= _component_levels.get(component, LEVELS.get(DEFAULT_LEVEL, 20))
+
+
+# --------------------------
+# Writer
+# --------------------------
+class LogWriter:
+    """Queue-backed JSON-lines writer with size/time rotation and a ring buffer of recent entries."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH, max_bytes=DEFAULT_MAX_BYTES, rotate_interval=DEFAULT_ROTATE_INTERVAL,
+                 backups=DEFAULT_BACKUPS, ring_size=DEFAULT_RING_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self._queue = queue.Queue()
+        self._ring = collections.deque(maxlen=ring_size)
+        self._ring_lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+        self._prime_ring()
+        self._thread = threading.Thread(target=self._run, name="app-log-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, entry):
+        with self._ring_lock:
+            self._ring.append(entry)
+        self._queue.put(entry)
+
+    def recent(self, limit=200, component=None, level=None):
+        """Newest-first entries from the ring buffer, optionally filtered."""
+        minimum = LEVELS.get(level, 0) if level else 0
+        with self._ring_lock:
+            entries = list(self._ring)
+        result = []
+        for entry in reversed(entries):
+            if component and entry.get("component") != component:
+                continue
+            if LEVELS.get(entry.get("level"), 0) < minimum:
+                continue
+            result.append(entry)
+            if len(result) >= limit:
+                break
+        return result
+
+    def flush(self, timeout=5):
+        """Block until everything emitted so far is on disk."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _prime_ring(self):
+        """Load the tail of the current log once at startup so the UI shows earlier entries."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 256 * 1024))
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        for line in lines[-self._ring.maxlen:]:
+            try:
+                self._ring.append(json.loads(line))
+            except ValueError:
+                continue  # partial first line of the tail, or a corrupt line
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+        if self._file.tell():
+            # Age the file from its first entry so time-based rotation survives restarts
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._opened_at = datetime.fromisoformat(json.loads(f.readline())["ts"]).timestamp()
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.rotate_interval) and time.time() - self._opened_at >= self.rotate_interval
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            while True:  # drain whatever piled up while the last batch was written
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [i for i in items if isinstance(i, dict)]
+            if entries:
+                self._write(entries)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is None for item in items):
+                if self._file:
+                    self._file.close()
+                return
+
+    def _write(self, entries):
+        try:
+            if self._file is None:
+                self._open()
+            self._file.write("".join(json.dumps(e, default=str) + "\n" for e in entries))
+            self._file.flush()
+            if self._should_rotate():
+                self._rotate()
+        except OSError as e:
+            print(f"[LOG] Failed to write {len(entries)} log entries: {e}")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Return the process-wide LogWriter, starting it on first use (flushed at exit)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                import atexit
+                _writer = LogWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+# --------------------------
+# Public API
+# --------------------------
+def log(component, level, message, **fields):
+    """Queue one entry; returns immediately. Entries below the component's level are dropped."""
+    if not is_enabled(component, level):
+        return
+    entry = {"ts": datetime.now().isoformat(), "level": level, "component": component, "msg": str(message)}
+    if fields:
+        entry.update(fields)
+    get_writer().emit(entry)
+
+
+def recent(limit=200, component=None, level=None):
+    """Newest-first recent entries from memory."""
+    return get_writer().recent(limit, component, level)
+
+
+def flush():
+    if _writer is not None:
+        _writer.flush()
+
+
+class Logger:
+    """Component-bound shortcut: get_logger("db").info("...")."""
+
+    def __init__(self, component):
+        self.component = component
+
+    def enabled(self, level):
+        return is_enabled(self.component, level)
+
+    def debug(self, message, **fields):
+        log(self.component, "DEBUG", message, **fields)
+
+    def info(self, message, **fields):
+        log(self.component, "INFO", message, **fields)
+
+    def warning(self, message, **fields):
+        log(self.component, "WARNING", message, **fields)
+
+    def error(self, message, **fields):
+        log(self.component, "ERROR", message, **fields)
+
+
+def get_logger(component):
+    return Logger(component)
@@ -0,0 +1,331 @@
+# async_ollama.py
+# asyncio client for the local Ollama daemon.
+# Many requests can be in flight at once without a thread each: each request takes a slot of its
+# model from the shared LLM scheduler (so async and queued sync work share one per-model limit),
+# every request can carry a deadline covering the wait for that slot, transient failures are
+# retried with jittered backoff, and cancelling the awaiting task aborts the HTTP request.
+# Sync code (Qt slots, Flask views) uses the wrappers at the bottom, which run coroutines on one
+# shared event-loop thread.
+
+import asyncio
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from Project_APP.APP.backend.llm_cache import make_key, should_cache
+from Project_APP.APP.backend.llm_scheduler import get_scheduler
+from Project_APP.APP.backend.ollama_client import (
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    OllamaError,
+    _normalize_host,
+    get_client,
+)
+
+# --------------------------
+# Configuration
+# --------------------------
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5  # seconds; base of the exponential backoff
+MAX_BACKOFF = 8.0
+RETRY_STATUS = {500, 502, 503, 504}
+
+
+class DeadlineExceeded(OllamaError):
+    """Raised when a request does not finish before its deadline."""
+
+
+class _RetryableError(OllamaError):
+    pass
+
+
+class AsyncOllamaClient:
+    """
+    Async counterpart of OllamaClient.
+
+    `deadline` on each call is a budget in seconds for the whole request, waiting for a model
+    slot and retries included. Streams are only retried if no token has been yielded yet.
+    """
+
+    def __init__(self, host=None, timeout=DEFAULT_TIMEOUT, keep_alive=DEFAULT_KEEP_ALIVE, pool_size=DEFAULT_POOL_SIZE,
+                 scheduler=None, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, cache=None):
+        self.host = _normalize_host(host or os.getenv("OLLAMA_HOST"))
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.scheduler = scheduler or get_scheduler()
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self._slot_loop = None
+        self._slot_freed = {}  # model -> asyncio.Event set when the scheduler frees one of its slots
+        self._http = httpx.AsyncClient(
+            base_url=self.host,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    async def generate(self, model, prompt, system=None, options=None, format=None, keep_alive=None, deadline=None,
+                       template_version="1", use_cache=None):
+        """Run a single prompt and return the full response text."""
+        key = self.cache_key(model, prompt, system, options, format, template_version, use_cache)
+        if key is not None:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+        payload = self._payload(model, prompt, False, system, options, format, keep_alive)
+        expires = self._expires(deadline)
+        async with self._model_slot(model, expires):
+            data = await self._with_retries(lambda: self._post("/api/generate", payload, expires), expires)
+        response = data.get("response", "")
+        if key is not None and response:
+            await asyncio.to_thread(self.cache.put, key, model, response)
+        return response
+
+    async def stream(self, model, prompt, system=None, options=None, format=None, keep_alive=None, deadline=None,
+                     template_version="1", use_cache=None):
+        """Async generator yielding response fragments as the model produces them."""
+        key = self.cache_key(model, prompt, system, options, format, template_version, use_cache)
+        if key is not None:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                yield cached
+                return
+        payload = self._payload(model, prompt, True, system, options, format, keep_alive)
+        expires = self._expires(deadline)
+        parts = []
+        async with self._model_slot(model, expires):
+            attempt = 0
+            while True:
+                try:
+                    async for token in self._stream_tokens(payload, expires):
+                        parts.append(token)
+                        yield token
+                    break
+                except _RetryableError as e:
+                    if parts or attempt >= self.retries:
+                        raise OllamaError(str(e)) from e
+                    await self._sleep_backoff(attempt, expires)
+                    attempt += 1
+        if key is not None and parts:
+            await asyncio.to_thread(self.cache.put, key, model, "".join(parts))
+
+    def cache_key(self, model, prompt, system=None, options=None, format=None, template_version="1", use_cache=None):
+        """Response-cache key for a generate request, or None if it would not be cached."""
+        if self.cache is None or not should_cache(options, use_cache):
+            return None
+        params = {"system": system, "options": options, "format": format}
+        return make_key(model, prompt, template_version=template_version, params=params)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    # --------------------------
+    # Internals
+    # --------------------------
+    @asynccontextmanager
+    async def _model_slot(self, model, expires):
+        """Hold one of the model's scheduler slots, waiting for it no longer than the deadline."""
+        loop = asyncio.get_running_loop()
+        if self._slot_loop is not loop:
+            if self._slot_loop is None:
+                self.scheduler.on_slot_freed(self._notify_slot_freed)
+            self._slot_loop, self._slot_freed = loop, {}
+        while True:
+            # Take the event before trying, so a slot freed in between still wakes us
+            freed = self._slot_freed.setdefault(model, asyncio.Event())
+            if self.scheduler.try_acquire(model):
+                break
+            wait = None if expires is None else self._remaining(expires)
+            try:
+                await asyncio.wait_for(freed.wait(), wait)
+            except asyncio.TimeoutError as e:
+                raise DeadlineExceeded(f"No {model} slot free before the deadline") from e
+        try:
+            yield
+        finally:
+            self.scheduler.release(model)
+
+    def _notify_slot_freed(self, model):
+        # Runs on the scheduler thread that released the slot
+        try:
+            self._slot_loop.call_soon_threadsafe(self._wake_slot_waiters, model)
+        except RuntimeError:
+            pass  # loop closed
+
+    def _wake_slot_waiters(self, model):
+        freed = self._slot_freed.pop(model, None)
+        if freed is not None:
+            freed.set()
+
+    def _payload(self, model, prompt, stream, system=None, options=None, format=None, keep_alive=None):
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": keep_alive if keep_alive is not None else self.keep_alive,
+        }
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        return payload
+
+    @staticmethod
+    def _expires(deadline):
+        return time.monotonic() + deadline if deadline else None
+
+    def _remaining(self, expires):
+        if expires is None:
+            return self.timeout
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded")
+        return min(remaining, self.timeout)
+
+    async def _sleep_backoff(self, attempt, expires):
+        """Full-jitter exponential backoff, never sleeping past the deadline."""
+        delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * (2 ** attempt)))
+        if expires is not None and time.monotonic() + delay >= expires:
+            raise DeadlineExceeded("Deadline exceeded while retrying")
+        await asyncio.sleep(delay)
+
+    async def _with_retries(self, make_call, expires):
+        attempt = 0
+        while True:
+            try:
+                return await make_call()
+            except _RetryableError as e:
+                if attempt >= self.retries:
+                    raise OllamaError(str(e)) from e
+                await self._sleep_backoff(attempt, expires)
+                attempt += 1
+
+    async def _post(self, path, payload, expires):
+        remaining = self._remaining(expires)
+        try:
+            resp = await asyncio.wait_for(self._http.post(path, json=payload, timeout=remaining), remaining)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded(f"{path} did not answer within {remaining:.1f}s") from e
+        except httpx.TimeoutException as e:
+            raise DeadlineExceeded(f"{path} timed out: {e}") from e
+        except httpx.TransportError as e:
+            raise _RetryableError(f"Request to {self.host}{path} failed: {e}") from e
+        if resp.status_code in RETRY_STATUS:
+            raise _RetryableError(f"Ollama returned {resp.status_code} for {path}: {resp.text[:200]}")
+        if resp.status_code != 200:
+            raise OllamaError(f"Ollama returned {resp.status_code} for {path}: {resp.text[:200]}")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise OllamaError(f"Invalid JSON from {path}: {e}") from e
+
+    async def _stream_tokens(self, payload, expires):
+        path = "/api/generate"
+        try:
+            async with self._http.stream("POST", path, json=payload, timeout=self._remaining(expires)) as resp:
+                if resp.status_code != 200:
+                    body = (await resp.aread()).decode("utf-8", "replace")
+                    error = _RetryableError if resp.status_code in RETRY_STATUS else OllamaError
+                    raise error(f"Ollama returned {resp.status_code} for {path}: {body[:200]}")
+                lines = resp.aiter_lines()
+                while True:
+                    try:
+                        line = await asyncio.wait_for(lines.__anext__(), self._remaining(expires))
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError as e:
+                        raise DeadlineExceeded(f"{path} stream exceeded its deadline") from e
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as e:
+                        raise OllamaError(f"Invalid stream chunk from {path}: {e}") from e
+                    if chunk.get("error"):
+                        raise OllamaError(chunk["error"])
+                    token = chunk.get("response", "")
+                    if token:
+                        yield token
+                    if chunk.get("done"):
+                        break
+        except httpx.TimeoutException as e:
+            raise DeadlineExceeded(f"{path} timed out: {e}") from e
+        except httpx.TransportError as e:
+            raise _RetryableError(f"Stream from {self.host}{path} failed: {e}") from e
+
+
+# --------------------------
+# Shared event loop thread
+# --------------------------
+_loop = None
+_client = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    """Return the shared event loop, starting its thread on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-async-loop", daemon=True).start()
+        return _loop
+
+
+def get_async_client():
+    """Return the process-wide AsyncOllamaClient (shares the response cache with the sync client)."""
+    global _client
+    get_loop()
+    with _lock:
+        if _client is None:
+            _client = AsyncOllamaClient(cache=get_client().cache)
+        return _client
+
+
+def submit(coro):
+    """Schedule a coroutine on the shared loop; returns a concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def generate_sync(model, prompt, **kwargs):
+    """Blocking wrapper around AsyncOllamaClient.generate for sync callers."""
+    return submit(get_async_client().generate(model, prompt, **kwargs)).result()
+
+
+def stream_sync(model, prompt, **kwargs):
+    """
+    Blocking generator over AsyncOllamaClient.stream for sync callers.
+    Closing the generator cancels the request on the loop.
+    """
+    items = queue.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for token in get_async_client().stream(model, prompt, **kwargs):
+                items.put(token)
+        finally:
+            items.put(done)
+
+    future = submit(pump())
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        future.result()  # re-raise errors from the stream
+    finally:
+        future.cancel()
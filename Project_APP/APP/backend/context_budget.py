@@ -0,0 +1,126 @@
+# context_budget.py
+# Assembles LLM prompt context from event-log history under a token budget.
+# Candidate items are ranked by relevance to the item being asked about (same subtask, same task,
+# recategorizations, same user, same category, recency), duplicates are collapsed, fields are
+# compacted, and items are added until the model's budget is spent. Prompt size therefore stays
+# bounded however much history a project accumulates.
+
+import json
+
+# --------------------------
+# Configuration
+# --------------------------
+# Rough characters per token for each model's tokenizer (JSON-heavy English text)
+CHARS_PER_TOKEN = {
+    "tinyllama:1.1b": 3.5,
+    "deepseek-r1:8b": 3.8,
+    "deepseek-r1:32b": 3.8,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Context tokens per request, leaving room for instructions and the answer
+DEFAULT_BUDGETS = {
+    "tinyllama:1.1b": 512,
+    "deepseek-r1:8b": 1536,
+    "deepseek-r1:32b": 2048,
+}
+DEFAULT_BUDGET = 512
+
+MAX_REASONING_CHARS = 160
+RECATEGORIZE_EVENTS = {"recategorization", "llm_suggestion"}
+
+# Relevance weights
+WEIGHT_SAME_SUBTASK = 6.0
+WEIGHT_SAME_TASK = 4.0
+WEIGHT_RECATEGORIZE = 2.0
+WEIGHT_SAME_USER = 1.0
+WEIGHT_SAME_CATEGORY = 1.0
+RECENCY_DECAY = 0.05  # per position in the newest-first history
+
+
+def estimate_tokens(text, model=None):
+    """Approximate token count of `text` for `model`."""
+    return int(len(text) / CHARS_PER_TOKEN.get(model, DEFAULT_CHARS_PER_TOKEN)) + 1
+
+
+def compact_item(item):
+    """Drop empty fields and truncate free text so each item costs as few tokens as possible."""
+    compact = {}
+    for key, value in item.items():
+        if value in (None, "", [], {}):
+            continue
+        if key == "reasoning" and isinstance(value, str) and len(value) > MAX_REASONING_CHARS:
+            value = value[:MAX_REASONING_CHARS - 3].rstrip() + "..."
+        compact[key] = value
+    return compact
+
+
+def _dedupe_key(item):
+    return (
+        item.get("event_type"),
+        item.get("task_id"),
+        item.get("subtask_id"),
+        item.get("old_category"),
+        item.get("new_category"),
+        item.get("reasoning"),
+    )
+
+
+def _current_category(items, target):
+    """Latest category recorded for the target item, if the history mentions it."""
+    for item in items:
+        if item.get("new_category") and (
+            (target.get("subtask_id") and item.get("subtask_id") == target["subtask_id"])
+            or (target.get("task_id") and item.get("task_id") == target["task_id"])
+        ):
+            return item["new_category"]
+    return None
+
+
+def score_item(item, position, target, category=None):
+    """Relevance of one history item to `target` ({user_id, task_id, subtask_id})."""
+    score = 0.0
+    if target.get("subtask_id") and item.get("subtask_id") == target["subtask_id"]:
+        score += WEIGHT_SAME_SUBTASK
+    if target.get("task_id") and item.get("task_id") == target["task_id"]:
+        score += WEIGHT_SAME_TASK
+    if item.get("event_type") in RECATEGORIZE_EVENTS:
+        score += WEIGHT_RECATEGORIZE
+    if target.get("user_id") and item.get("user_id") == target["user_id"]:
+        score += WEIGHT_SAME_USER
+    if category and category in (item.get("old_category"), item.get("new_category")):
+        score += WEIGHT_SAME_CATEGORY
+    return score + 1.0 / (1.0 + RECENCY_DECAY * position)
+
+
+def assemble_context(items, model=None, target=None, budget=None):
+    """
+    Select context items for a prompt.
+
+    `items` are dicts ordered newest first (as get_event_logs returns them).
+    Returns (selected items in newest-first order, estimated tokens used).
+    """
+    target = target or {}
+    budget = budget if budget is not None else DEFAULT_BUDGETS.get(model, DEFAULT_BUDGET)
+    category = _current_category(items, target)
+
+    seen = set()
+    candidates = []
+    for position, item in enumerate(items):
+        key = _dedupe_key(item)
+        if key in seen:
+            continue  # keep only the newest copy of a repeated event
+        seen.add(key)
+        compact = compact_item(item)
+        cost = estimate_tokens(json.dumps(compact, separators=(",", ":"), default=str), model)
+        candidates.append((score_item(item, position, target, category), position, compact, cost))
+
+    selected = []
+    used = 2  # the enclosing list brackets
+    for score, position, compact, cost in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        if used + cost > budget:
+            continue  # a smaller, lower-ranked item may still fit
+        selected.append((position, compact))
+        used += cost
+    selected.sort(key=lambda s: s[0])
+    return [compact for _, compact in selected], used
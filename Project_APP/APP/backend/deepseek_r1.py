@@ -1,28 +1,123 @@
-import subprocess
-from pathlib import Path
+from concurrent.futures import CancelledError
+
+from Project_APP.APP.backend.async_ollama import get_async_client, submit
+from Project_APP.APP.backend.llm_scheduler import DEFAULT_RUN_TIMEOUT, INTERACTIVE, JobTimeoutError, QueueFullError, get_scheduler
+from Project_APP.APP.backend.model_manager import keep_alive_for
+from Project_APP.APP.backend.ollama_client import OllamaError, get_client
+from Project_APP.APP.backend.structured_output import generate_structured
+from Project_APP.APP.backend.reasoning_filter import filter_stream, strip_reasoning
 
 class DeepSeekR1:
     """
-    Interface to DeepSeek R1 8B via Ollama local model runner.
+    Interface to DeepSeek R1 8B via the local Ollama daemon (HTTP API).
     """
 
-    def __init__(self, model_name="deepseek-r1:8b"):
+    # Bump when prompt construction changes so stale cached responses are not reused
+    PROMPT_TEMPLATE_VERSION = "1"
+
+    def __init__(self, model_name="deepseek-r1:8b", client=None, task=None):
         self.model_name = model_name
-        if not Path("C:/Program Files/Ollama/ollama.exe").exists():
-            raise EnvironmentError("Ollama executable not found. Install Ollama first.")
+        self.task = task  # request type (model_router) reported with each job's latency
+        # Shared pooled client; the daemon keeps the model warm between calls
+        self.client = client or get_client()
 
-    def query_llm(self, prompt: str) -> str:
+    def query_llm(self, prompt: str, priority=INTERACTIVE, key=None, options=None, use_cache=None,
+                  wait_timeout=DEFAULT_RUN_TIMEOUT) -> str:
         """
-        Run the prompt on DeepSeek R1 8B via Ollama CLI.
+        Run the prompt on DeepSeek R1 8B via the Ollama HTTP API and return the answer
+        with the <think> reasoning trace removed.
+        The call is queued on the shared LLM scheduler under the given priority class.
+        `options` are Ollama sampling options; deterministic ones (llm_cache.DETERMINISTIC_OPTIONS)
+        let a repeated prompt answer from the response cache.
         """
         try:
-            result = subprocess.run(
-                ["ollama", "run", self.model_name, "--prompt", prompt],
-                capture_output=True,
-                text=True,
-                check=True
+            response = get_scheduler().run(
+                self.model_name,
+                self.client.generate,
+                self.model_name,
+                prompt,
+                options=options,
+                keep_alive=keep_alive_for(self.model_name),
+                template_version=self.PROMPT_TEMPLATE_VERSION,
+                use_cache=use_cache,
+                priority=priority,
+                key=key,
+                task=self.task,
+                wait_timeout=wait_timeout,
             )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
+            return strip_reasoning(response)
+        except (OllamaError, QueueFullError, JobTimeoutError, CancelledError) as e:
             print("Error running DeepSeek R1 8B via Ollama:", e)
             return ""
+
+    def stream_llm(self, prompt: str, priority=INTERACTIVE, key=None, on_reasoning=None, on_answer_start=None,
+                   options=None, use_cache=None):
+        """
+        Yield the DeepSeek R1 8B answer token by token as it is generated.
+        Reasoning tokens are not yielded; pass `on_reasoning` to receive them separately and
+        `on_answer_start` to be told when the answer begins.
+        """
+        try:
+            tokens = get_scheduler().stream(
+                self.model_name,
+                lambda: self.client.stream_generate(
+                    self.model_name, prompt, options=options, keep_alive=keep_alive_for(self.model_name),
+                    template_version=self.PROMPT_TEMPLATE_VERSION, use_cache=use_cache,
+                ),
+                priority=priority,
+                key=key,
+                task=self.task,
+            )
+            yield from filter_stream(tokens, on_reasoning=on_reasoning, on_answer_start=on_answer_start)
+        except (OllamaError, QueueFullError, CancelledError) as e:
+            print("Error streaming DeepSeek R1 8B via Ollama:", e)
+
+    def query_json(self, prompt: str, schema=None, priority=INTERACTIVE, key=None, options=None, use_cache=None,
+                   wait_timeout=DEFAULT_RUN_TIMEOUT):
+        """
+        Run the prompt in JSON mode and return the parsed value, or None on failure.
+        `schema` (a JSON schema dict) constrains the output; generation stops once the value closes.
+        """
+        try:
+            return get_scheduler().run(
+                self.model_name,
+                generate_structured,
+                self.client,
+                self.model_name,
+                prompt,
+                schema=schema,
+                options=options,
+                keep_alive=keep_alive_for(self.model_name),
+                template_version=self.PROMPT_TEMPLATE_VERSION,
+                use_cache=use_cache,
+                priority=priority,
+                key=key,
+                task=self.task,
+                wait_timeout=wait_timeout,
+            )
+        except (OllamaError, QueueFullError, JobTimeoutError, CancelledError) as e:
+            print("Error running DeepSeek R1 8B via Ollama:", e)
+            return None
+
+    async def query_llm_async(self, prompt: str, deadline=None, options=None, use_cache=None) -> str:
+        """
+        Awaitable variant of query_llm for asyncio callers.
+        `deadline` is the budget in seconds for the whole request, retries included.
+        """
+        try:
+            response = await get_async_client().generate(
+                self.model_name, prompt, options=options, deadline=deadline,
+                keep_alive=keep_alive_for(self.model_name), template_version=self.PROMPT_TEMPLATE_VERSION,
+                use_cache=use_cache,
+            )
+            return strip_reasoning(response)
+        except OllamaError as e:
+            print("Error running DeepSeek R1 8B via Ollama:", e)
+            return ""
+
+    def submit_llm(self, prompt: str, deadline=None, options=None, use_cache=None):
+        """
+        Start the prompt on the shared event loop without blocking.
+        Returns a concurrent.futures.Future resolving to the response text; cancel() aborts it.
+        """
+        return submit(self.query_llm_async(prompt, deadline=deadline, options=options, use_cache=use_cache))
@@ -0,0 +1,163 @@
+# fake_ollama.py
+# Minimal stand-in for the Ollama HTTP API so the backend can be exercised without a real model.
+#
+# Usage:
+#   python -m Project_APP.APP.backend.fake_ollama          # serve on 127.0.0.1:11434
+#
+#   with FakeOllamaServer(responder=lambda model, prompt: "[]") as server:
+#       client = OllamaClient(host=server.url)
+#       client.generate("tinyllama:1.1b", "hello")
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def echo_responder(model, prompt):
+    """Default responder: echo the prompt back, tagged with the model name."""
+    return f"[{model}] {prompt}"
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real daemon
+
+    def log_message(self, format, *args):
+        pass  # keep test output quiet
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, obj, status=200):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, chunks):
+        """Write NDJSON chunks with chunked transfer encoding, flushing each one."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for obj in chunks:
+                data = (json.dumps(obj) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+                if self.server.token_delay:
+                    time.sleep(self.server.token_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client stopped reading (cancelled or stopped early)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": name} for name in sorted(self.server.loaded_models)]})
+        elif self.path == "/api/ps":
+            self._send_json({"models": [{"name": name, "size": 0} for name in sorted(self.server.resident_models)]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        payload = self._read_json()
+        model = payload.get("model", "")
+        self.server.requests.append((self.path, payload))
+        if self.path == "/api/generate":
+            if "prompt" not in payload:
+                # Load / unload request: no generation, just change residency
+                if payload.get("keep_alive") in (0, "0", "0s"):
+                    self.server.resident_models.discard(model)
+                else:
+                    self.server.resident_models.add(model)
+                self._send_json({"model": model, "response": "", "done": True})
+                return
+            prompt = payload.get("prompt", "")
+        elif self.path == "/api/chat":
+            messages = payload.get("messages") or [{}]
+            prompt = messages[-1].get("content", "")
+        else:
+            self._send_json({"error": "not found"}, status=404)
+            return
+        self.server.loaded_models.add(model)
+        self.server.resident_models.add(model)
+        text = self.server.responder(model, prompt)
+        if payload.get("stream", True):
+            self._send_stream(self._stream_chunks(model, text))
+        elif self.path == "/api/chat":
+            self._send_json({"model": model, "message": {"role": "assistant", "content": text}, "done": True})
+        else:
+            self._send_json({"model": model, "response": text, "done": True})
+
+    def _stream_chunks(self, model, text):
+        for token in re.findall(r"\S+\s*|\s+", text):
+            if self.path == "/api/chat":
+                yield {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+            else:
+                yield {"model": model, "response": token, "done": False}
+        if self.path == "/api/chat":
+            yield {"model": model, "message": {"role": "assistant", "content": ""}, "done": True}
+        else:
+            yield {"model": model, "response": "", "done": True}
+
+
+class FakeOllamaServer:
+    """
+    Threaded HTTP server implementing the subset of the Ollama API used by the backend.
+    `responder(model, prompt) -> str` decides what the "model" answers.
+    Streaming requests get the answer back one word per chunk, `token_delay` seconds apart.
+    Every request payload is recorded in `requests` for assertions.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, responder=echo_responder, token_delay=0.0):
+        self.httpd = ThreadingHTTPServer((host, port), _FakeOllamaHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.responder = responder
+        self.httpd.requests = []
+        self.httpd.loaded_models = set()
+        self.httpd.resident_models = set()
+        self.httpd.token_delay = token_delay
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = FakeOllamaServer(port=11434)
+    print(f"Fake Ollama listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,299 @@
+# llm_scheduler.py
+# Central in-process scheduler for LLM work.
+# Interactive requests (plan generation, time suggestions, Eisenhower suggestions) are dispatched
+# ahead of background work (commit summaries), each model has a bounded number of concurrent jobs,
+# and queues are depth-limited so a burst of file saves cannot starve a waiting user.
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# --------------------------
+# Configuration
+# --------------------------
+INTERACTIVE = 0
+BACKGROUND = 10
+PRIORITIES = (INTERACTIVE, BACKGROUND)  # dispatch order
+
+DEFAULT_MODEL_CONCURRENCY = {
+    "tinyllama:1.1b": 2,
+    "deepseek-r1:8b": 1,
+    "deepseek-r1:32b": 1,
+}
+DEFAULT_QUEUE_DEPTH = {
+    INTERACTIVE: 32,
+    BACKGROUND: 64,
+}
+DEFAULT_WORKERS = 4
+DEFAULT_RUN_TIMEOUT = 900  # seconds run() waits for a result, queueing included
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a priority class queue is at its depth limit."""
+
+
+class JobTimeoutError(TimeoutError):
+    """Raised by run() when the job has not finished within its wait timeout."""
+
+
+class _Job:
+    __slots__ = ("model", "fn", "args", "kwargs", "priority", "key", "task", "future")
+
+    def __init__(self, model, fn, args, kwargs, priority, key, task=None):
+        self.model = model
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.task = task
+        self.future = Future()
+
+
+class LLMScheduler:
+    """
+    Priority scheduler with per-model concurrency limits.
+
+    submit() returns a concurrent.futures.Future. Jobs submitted with a `key`
+    supersede (cancel) any still-queued job with the same key. Jobs submitted with a
+    `task` (request type) report their run time, queueing excluded, to on_job_timed listeners.
+    """
+
+    def __init__(self, model_concurrency=None, default_concurrency=1, queue_depth=None, workers=DEFAULT_WORKERS):
+        self.model_concurrency = dict(DEFAULT_MODEL_CONCURRENCY if model_concurrency is None else model_concurrency)
+        self.default_concurrency = default_concurrency
+        self.queue_depth = dict(DEFAULT_QUEUE_DEPTH if queue_depth is None else queue_depth)
+        self._queues = {p: deque() for p in PRIORITIES}
+        self._by_key = {}
+        self._running = {}
+        self._slot_listeners = []
+        self._timing_listeners = []
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"llm-scheduler-{i}", daemon=True) for i in range(workers)
+        ]
+        for t in self._workers:
+            t.start()
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def submit(self, model, fn, *args, priority=INTERACTIVE, key=None, task=None, block=False, block_timeout=None,
+               **kwargs):
+        """
+        Queue fn(*args, **kwargs) to run against `model`.
+        If the priority queue is full, raise QueueFullError, or with block=True wait up to
+        `block_timeout` seconds for space (backpressure).
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler is shut down")
+            if key is not None:
+                self._supersede(key)
+            limit = self.queue_depth.get(priority)
+            if limit is not None and len(self._queues[priority]) >= limit:
+                if not block or not self._cond.wait_for(
+                    lambda: len(self._queues[priority]) < limit or self._shutdown, timeout=block_timeout
+                ):
+                    raise QueueFullError(f"LLM queue full for priority {priority} ({limit} jobs)")
+            job = _Job(model, fn, args, kwargs, priority, key, task)
+            self._queues[priority].append(job)
+            if key is not None:
+                self._by_key[key] = job
+            self._cond.notify_all()
+        return job.future
+
+    def run(self, model, fn, *args, priority=INTERACTIVE, key=None, task=None, wait_timeout=DEFAULT_RUN_TIMEOUT,
+            **kwargs):
+        """
+        Submit and wait for the result (blocking convenience wrapper).
+        Raises JobTimeoutError after `wait_timeout` seconds (None waits forever); a job still
+        queued by then is dropped, a running one finishes but its result is discarded.
+        """
+        future = self.submit(model, fn, *args, priority=priority, key=key, task=task, **kwargs)
+        try:
+            return future.result(timeout=wait_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise JobTimeoutError(f"{model} job did not finish within {wait_timeout}s") from None
+
+    def stream(self, model, gen_factory, priority=INTERACTIVE, key=None, task=None):
+        """
+        Run a token generator under the scheduler and yield its items on the caller's thread.
+        The model slot is held for the whole stream; closing the returned generator stops it.
+        """
+        items = queue.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def pump():
+            try:
+                for item in gen_factory():
+                    if stop.is_set():
+                        break
+                    items.put(item)
+            finally:
+                items.put(done)
+
+        future = self.submit(model, pump, priority=priority, key=key, task=task)
+        future.add_done_callback(lambda f: items.put(done) if f.cancelled() else None)
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    break
+                yield item
+            if not future.cancelled():
+                future.result()  # re-raise errors from the generator
+        finally:
+            stop.set()
+            future.cancel()  # no-op once running; drops the job if still queued
+
+    def try_acquire(self, model):
+        """
+        Take one of the model's slots outside the job queue (for asyncio callers, which must not
+        block a thread). Returns False when none is free; pair a True with release().
+        """
+        with self._cond:
+            if self._shutdown or self._running.get(model, 0) >= self._limit(model):
+                return False
+            self._running[model] = self._running.get(model, 0) + 1
+            return True
+
+    def release(self, model):
+        """Give back a slot taken with try_acquire."""
+        with self._cond:
+            self._running[model] -= 1
+            self._cond.notify_all()
+        self._slot_freed(model)
+
+    def on_slot_freed(self, callback):
+        """Call callback(model) (on the releasing thread) whenever one of the model's slots frees up."""
+        with self._cond:
+            self._slot_listeners.append(callback)
+
+    def on_job_timed(self, callback):
+        """Call callback(model, task, seconds) (on the worker thread) after each job submitted with a task succeeds."""
+        with self._cond:
+            self._timing_listeners.append(callback)
+
+    def cancel(self, key):
+        """Cancel the queued job registered under `key`. Returns True if one was cancelled."""
+        with self._cond:
+            return self._supersede(key)
+
+    def depth(self, priority=None, model=None):
+        """Number of queued (not yet running) jobs, optionally filtered."""
+        with self._cond:
+            queues = [self._queues[priority]] if priority is not None else self._queues.values()
+            return sum(1 for q in queues for job in q if model is None or job.model == model)
+
+    def running(self, model=None):
+        with self._cond:
+            if model is not None:
+                return self._running.get(model, 0)
+            return sum(self._running.values())
+
+    def shutdown(self, wait=True):
+        """Stop accepting work, cancel queued jobs and stop the workers."""
+        with self._cond:
+            self._shutdown = True
+            for q in self._queues.values():
+                while q:
+                    q.popleft().future.cancel()
+            self._by_key.clear()
+            self._cond.notify_all()
+        if wait:
+            for t in self._workers:
+                t.join(timeout=5)
+
+    # --------------------------
+    # Internals (call with self._cond held)
+    # --------------------------
+    def _supersede(self, key):
+        old = self._by_key.pop(key, None)
+        if old is None:
+            return False
+        try:
+            self._queues[old.priority].remove(old)
+        except ValueError:
+            return False  # already dispatched
+        old.future.cancel()
+        self._cond.notify_all()
+        return True
+
+    def _slot_freed(self, model):
+        # Call without self._cond held
+        for callback in list(self._slot_listeners):
+            callback(model)
+
+    def _job_timed(self, job, seconds):
+        # Call without self._cond held, on the thread that ran the job
+        for callback in list(self._timing_listeners):
+            callback(job.model, job.task, seconds)
+
+    def _limit(self, model):
+        return self.model_concurrency.get(model, self.default_concurrency)
+
+    def _next_job(self):
+        for priority in PRIORITIES:
+            q = self._queues[priority]
+            for job in q:
+                if self._running.get(job.model, 0) < self._limit(job.model):
+                    q.remove(job)
+                    if job.key is not None and self._by_key.get(job.key) is job:
+                        del self._by_key[job.key]
+                    return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = None
+                while not self._shutdown:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if job is None:
+                    return
+                self._running[job.model] = self._running.get(job.model, 0) + 1
+                self._cond.notify_all()  # queue space freed for blocked submitters
+            elapsed = None
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    start = time.monotonic()
+                    try:
+                        job.future.set_result(job.fn(*job.args, **job.kwargs))
+                        elapsed = time.monotonic() - start
+                    except BaseException as e:
+                        job.future.set_exception(e)
+                if elapsed is not None and job.task is not None:
+                    self._job_timed(job, elapsed)
+            finally:
+                with self._cond:
+                    self._running[job.model] -= 1
+                    self._cond.notify_all()
+                self._slot_freed(job.model)
+
+
+# --------------------------
+# Shared instance
+# --------------------------
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide LLMScheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
+
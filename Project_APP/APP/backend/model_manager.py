@@ -0,0 +1,263 @@
+# model_manager.py
+# Keeps local models warm so the first request after start-up does not pay the load cost.
+# Configured models are preloaded in the background smallest first, kept resident for a
+# keep-alive window, and idle large models are unloaded when the machine runs low on memory.
+# Readiness is published to listeners (e.g. the Qt LoadingManager).
+
+import os
+import threading
+import time
+
+from Project_APP.APP.backend.llm_scheduler import get_scheduler
+from Project_APP.APP.backend.ollama_client import OllamaError, get_client
+
+# --------------------------
+# Configuration
+# --------------------------
+COLD = "cold"
+LOADING = "loading"
+READY = "ready"
+UNLOADED = "unloaded"
+ERROR = "error"
+SKIPPED = "skipped"  # not installed on the daemon, so never preloaded
+# Preloading has finished with the model, one way or another; UNLOADED counts because a model
+# only gets there after loading (the keep-alive expired or it was unloaded under memory pressure)
+SETTLED = (READY, UNLOADED, ERROR, SKIPPED)
+
+DEFAULT_PRELOAD = [m.strip() for m in os.getenv("LLM_PRELOAD_MODELS", "tinyllama:1.1b,deepseek-r1:8b").split(",") if m.strip()]
+DEFAULT_PINNED = ["tinyllama:1.1b"]  # small enough to never unload
+DEFAULT_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+DEFAULT_MEMORY_THRESHOLD = 0.90  # fraction of RAM in use that counts as pressure
+DEFAULT_CHECK_INTERVAL = 30  # seconds between keep-alive / memory checks
+DEFAULT_LOAD_TIMEOUT = 600  # seconds; 32b on CPU is slow to load
+
+# Approximate resident size, used to pick what to unload first
+MODEL_SIZE_RANK = {
+    "tinyllama:1.1b": 1,
+    "deepseek-r1:8b": 8,
+    "deepseek-r1:32b": 32,
+}
+
+
+def memory_usage():
+    """Return the fraction of physical memory in use, or None if it cannot be determined."""
+    try:
+        import psutil
+        return psutil.virtual_memory().percent / 100.0
+    except ImportError:
+        pass
+    try:
+        info = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                info[name] = int(value.split()[0])
+        return 1.0 - info["MemAvailable"] / info["MemTotal"]
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+class ModelLifecycleManager:
+    """
+    Preloads models, refreshes their keep-alive while they are in use and unloads idle
+    non-pinned models under memory pressure.
+
+    Listeners registered with add_listener() are called as listener(model, state) from the
+    manager's thread whenever a model changes state.
+    """
+
+    def __init__(self, models=None, pinned=None, keep_alive=DEFAULT_KEEP_ALIVE, client=None, scheduler=None,
+                 memory_threshold=DEFAULT_MEMORY_THRESHOLD, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.models = sorted(DEFAULT_PRELOAD if models is None else models, key=lambda m: MODEL_SIZE_RANK.get(m, 0))
+        self.pinned = set(DEFAULT_PINNED if pinned is None else pinned)
+        self.keep_alive = keep_alive
+        self.client = client or get_client()
+        self.scheduler = scheduler
+        self.memory_threshold = memory_threshold
+        self.check_interval = check_interval
+        self._states = {m: COLD for m in self.models}
+        self._last_used = {}
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def start(self):
+        """Begin preloading in the background and return immediately."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-lifecycle", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def state(self, model):
+        with self._cond:
+            return self._states.get(model, COLD)
+
+    def states(self):
+        with self._cond:
+            return dict(self._states)
+
+    def is_ready(self, model):
+        return self.state(model) == READY
+
+    def keep_alive_for(self, model):
+        """Keep-alive to send with requests for `model` (-1 keeps pinned models resident)."""
+        return -1 if model in self.pinned else self.keep_alive
+
+    def progress(self):
+        """Fraction of configured models that have finished loading (ready, since unloaded, failed or skipped)."""
+        with self._cond:
+            if not self._states:
+                return 1.0
+            done = sum(1 for s in self._states.values() if s in SETTLED)
+            return done / len(self._states)
+
+    def wait_ready(self, model, timeout=None):
+        """Block until `model` is ready; returns False on timeout, load failure, skip or unload."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._states.get(model) in SETTLED, timeout=timeout)
+            return self._states.get(model) == READY
+
+    def ensure_loaded(self, model):
+        """Load `model` now (on the caller's thread) if it is not already resident."""
+        if self.state(model) != READY:
+            self._load(model)
+        return self.is_ready(model)
+
+    def touch(self, model):
+        """Record that `model` was just used so it is not treated as idle."""
+        with self._cond:
+            self._last_used[model] = time.monotonic()
+
+    # --------------------------
+    # Internals
+    # --------------------------
+    def _set_state(self, model, state):
+        with self._cond:
+            if self._states.get(model) == state:
+                return
+            self._states[model] = state
+            self._cond.notify_all()
+        for listener in list(self._listeners):
+            try:
+                listener(model, state)
+            except Exception as e:
+                print(f"[Models] Listener error: {e}")
+
+    def _load(self, model):
+        self._set_state(model, LOADING)
+        try:
+            self.client.load_model(model, keep_alive=self.keep_alive_for(model), timeout=DEFAULT_LOAD_TIMEOUT)
+        except OllamaError as e:
+            print(f"[Models] Failed to load {model}: {e}")
+            self._set_state(model, ERROR)
+            return
+        self.touch(model)
+        self._set_state(model, READY)
+
+    def _busy(self, model):
+        scheduler = self.scheduler or get_scheduler()
+        return scheduler.running(model) > 0 or scheduler.depth(model=model) > 0
+
+    def _run(self):
+        try:
+            installed = set(self.client.list_models())
+        except OllamaError as e:
+            print(f"[Models] Could not list installed models: {e}")
+            installed = None  # try them all; failures end up in ERROR
+        for model in self.models:
+            if self._stop.is_set():
+                return
+            if installed is not None and model not in installed:
+                print(f"[Models] {model} is not installed; skipping preload")
+                self._set_state(model, SKIPPED)
+                continue
+            self._load(model)
+        while not self._stop.wait(self.check_interval):
+            self._check()
+
+    def _check(self):
+        """Sync states with the daemon and relieve memory pressure."""
+        try:
+            resident = self.client.running_models()
+        except OllamaError as e:
+            print(f"[Models] Could not query resident models: {e}")
+            return
+        for model in self.models:
+            if self.state(model) == SKIPPED:
+                continue
+            if model in self.pinned and model not in resident:
+                self._load(model)
+            elif model in self.pinned:
+                # Requests that do not go through keep_alive_for() reset the keep-alive, so re-pin
+                try:
+                    self.client.load_model(model, keep_alive=-1)
+                except OllamaError as e:
+                    print(f"[Models] Failed to refresh {model}: {e}")
+                self._set_state(model, READY)
+            elif model in resident:
+                if self._busy(model):
+                    self.touch(model)
+                self._set_state(model, READY)
+            elif self.state(model) == READY:
+                # The daemon expired it after the keep-alive window
+                self._set_state(model, UNLOADED)
+        usage = memory_usage()
+        if usage is None or usage < self.memory_threshold:
+            return
+        # Largest, longest-idle first; pinned and busy models are never unloaded
+        candidates = [
+            m for m in resident
+            if m not in self.pinned and not self._busy(m)
+        ]
+        candidates.sort(key=lambda m: (-MODEL_SIZE_RANK.get(m, 0), self._last_used.get(m, 0)))
+        for model in candidates:
+            print(f"[Models] Memory at {usage:.0%}; unloading idle model {model}")
+            try:
+                self.client.unload_model(model)
+            except OllamaError as e:
+                print(f"[Models] Failed to unload {model}: {e}")
+                continue
+            if model in self._states:
+                self._set_state(model, UNLOADED)
+            usage = memory_usage()
+            if usage is None or usage < self.memory_threshold:
+                break
+
+
+# --------------------------
+# Shared instance
+# --------------------------
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def keep_alive_for(model):
+    """
+    Keep-alive for a request to `model`: the started manager's window (or -1 if pinned),
+    otherwise None so the client's default applies.
+    """
+    manager = _manager
+    if manager is None or manager._thread is None:
+        return None
+    return manager.keep_alive_for(model)
+
+
+def get_model_manager():
+    """Return the process-wide ModelLifecycleManager, creating it on first use (not started)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ModelLifecycleManager()
+        return _manager
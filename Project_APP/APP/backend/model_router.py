@@ -0,0 +1,218 @@
+# model_router.py
+# Picks which local model serves a request.
+# Each request type has a quality bar; the router chooses the cheapest model whose benchmarked
+# quality meets it within the caller's latency budget, and steps down to a smaller model when
+# the scheduler queue for the preferred one is backed up.
+
+import csv
+import os
+import threading
+
+from Project_APP.APP.backend.deepseek_r1 import DeepSeekR1
+from Project_APP.APP.backend.deepseek_r1_32b import DeepSeekR1_32B
+from Project_APP.APP.backend.llm_scheduler import DEFAULT_MODEL_CONCURRENCY, get_scheduler
+from Project_APP.APP.backend.ollama_client import served_from_cache
+from Project_APP.APP.backend.tiny_llama import TinyLlamaPlanner
+
+# --------------------------
+# Configuration
+# --------------------------
+SPRINT_PLAN = "sprint_plan"
+EISENHOWER = "eisenhower"
+COMMIT_SUMMARY = "commit_summary"
+TIME_SUGGESTION = "time_suggestion"
+TASKS = (SPRINT_PLAN, EISENHOWER, COMMIT_SUMMARY, TIME_SUGGESTION)
+
+# Cheapest first
+MODELS = ("tinyllama:1.1b", "deepseek-r1:8b", "deepseek-r1:32b")
+PLANNERS = {
+    "tinyllama:1.1b": TinyLlamaPlanner,
+    "deepseek-r1:8b": DeepSeekR1,
+    "deepseek-r1:32b": DeepSeekR1_32B,
+}
+
+# Minimum benchmark score (accuracy / feasibility rate) a model needs for each request type.
+# These are what the output must achieve to be usable, taken from the evaluation in
+# Project_APP/Report and Benchmarks/Test_Results, not from any one model's score.
+QUALITY_BAR = {
+    SPRINT_PLAN: 0.8,  # at least 4 in 5 generated plans schedule feasibly
+    EISENHOWER: 0.7,  # quadrant accuracy of the evaluated deepseek-r1:8b runs (mean 0.717)
+    COMMIT_SUMMARY: 0.1,  # lexical overlap; summaries judged accurate scored 0.13 on average
+    TIME_SUGGESTION: 0.6,  # no benchmark yet; estimates feed the schedule like sprint effort
+}
+
+# Fallback profile (quality, mean latency in seconds) used where the benchmarks have no data
+DEFAULT_PROFILE = {
+    "tinyllama:1.1b": {SPRINT_PLAN: (0.6, 4.0), EISENHOWER: (0.35, 4.5), COMMIT_SUMMARY: (0.25, 1.5), TIME_SUGGESTION: (0.3, 3.0)},
+    "deepseek-r1:8b": {SPRINT_PLAN: (0.7, 320.0), EISENHOWER: (0.7, 40.0), COMMIT_SUMMARY: (0.5, 50.0), TIME_SUGGESTION: (0.6, 40.0)},
+    "deepseek-r1:32b": {SPRINT_PLAN: (0.85, 900.0), EISENHOWER: (0.85, 120.0), COMMIT_SUMMARY: (0.7, 150.0), TIME_SUGGESTION: (0.8, 120.0)},
+}
+
+# Benchmark `test_type` values mapped to request types
+TEST_TYPES = {
+    "sprint planner": SPRINT_PLAN,
+    "sprint": SPRINT_PLAN,
+    "eisenhower": EISENHOWER,
+    "commit summary": COMMIT_SUMMARY,
+}
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+DEFAULT_BENCHMARK_FILES = [
+    os.path.join(_REPO_ROOT, "Archive", "Test_Results", "benchmark_results.csv"),
+    os.path.join(_REPO_ROOT, "Archive", "Test_Results", "deepseek_r1_8b_commit_summary.csv"),
+    os.path.join(_REPO_ROOT, "Project_APP", "Benchmarks", "Test_Scripts", "Test_Results", "deepseek_r1_8b_sprint_benchmark.csv"),
+]
+
+MIN_VALID_LATENCY = 0.1  # faster rows are connection failures, not model runs
+OVERLOAD_DEPTH = 4  # queued jobs per model slot before stepping down a size
+EWMA_ALPHA = 0.2  # weight of a new latency observation
+
+
+def load_benchmark_profile(paths=None):
+    """
+    Aggregate benchmark CSVs into {model: {task: (quality, mean_latency)}}.
+    Rows need `model` and `time_s`; quality comes from `accuracy` or `feasible`.
+    Files that are missing or unreadable are skipped.
+    """
+    sums = {}
+    for path in DEFAULT_BENCHMARK_FILES if paths is None else paths:
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    model = (row.get("model") or "").strip()
+                    task = TEST_TYPES.get((row.get("test_type") or "sprint").strip().lower())
+                    if model not in PLANNERS or task is None:
+                        continue
+                    try:
+                        latency = float(row.get("time_s") or row.get("time") or 0)
+                        if "accuracy" in row:
+                            quality = float(row["accuracy"] or 0)
+                        else:
+                            quality = 1.0 if str(row.get("feasible")).strip().lower() == "true" else 0.0
+                    except ValueError:
+                        continue
+                    if latency < MIN_VALID_LATENCY:
+                        continue
+                    q, t, n = sums.get((model, task), (0.0, 0.0, 0))
+                    sums[(model, task)] = (q + quality, t + latency, n + 1)
+        except (OSError, csv.Error) as e:
+            print(f"[Router] Skipping benchmark file {path}: {e}")
+    profile = {}
+    for (model, task), (q, t, n) in sums.items():
+        profile.setdefault(model, {})[task] = (q / n, t / n)
+    return profile
+
+
+class ModelRouter:
+    """
+    Chooses a model per request type, latency budget and current load.
+    The profile starts from DEFAULT_PROFILE overlaid with benchmark results, and observed
+    latencies are folded in as requests complete.
+    """
+
+    def __init__(self, profile=None, benchmark_files=None, quality_bar=None, scheduler=None, overload_depth=OVERLOAD_DEPTH):
+        self.profile = {model: dict(tasks) for model, tasks in DEFAULT_PROFILE.items()}
+        seed = load_benchmark_profile(benchmark_files) if profile is None else profile
+        for model, tasks in seed.items():
+            self.profile.setdefault(model, {}).update(tasks)
+        self.quality_bar = dict(QUALITY_BAR if quality_bar is None else quality_bar)
+        self.scheduler = scheduler
+        self.overload_depth = overload_depth
+        self._lock = threading.Lock()
+
+    # --------------------------
+    # Routing
+    # --------------------------
+    def choose(self, task, latency_slo=None, queue_depth=None, models=MODELS):
+        """
+        Return the model name to use for `task`.
+        `latency_slo` is a budget in seconds; `queue_depth` overrides the scheduler's
+        per-model queue depth (e.g. {"deepseek-r1:8b": 3} or a single int for all models).
+        `models` restricts the candidates (cheapest first).
+        """
+        if task not in self.quality_bar:
+            raise ValueError(f"Unknown request type: {task}")
+        if not models:
+            raise ValueError(f"No candidate models for {task}")
+        bar = self.quality_bar[task]
+        estimates = [(model, *self._estimate(model, task, queue_depth)) for model in models]
+
+        chosen = None
+        for model, quality, latency, _ in estimates:
+            if quality >= bar and (latency_slo is None or latency <= latency_slo):
+                chosen = model
+                break
+        if chosen is None:
+            # Nothing meets both: keep the latency budget and take the best quality within it,
+            # otherwise the fastest model available.
+            in_budget = [e for e in estimates if latency_slo is None or e[2] <= latency_slo]
+            if in_budget:
+                chosen = max(in_budget, key=lambda e: e[1])[0]
+            else:
+                chosen = min(estimates, key=lambda e: e[2])[0]
+
+        # Under load step down to a smaller model rather than queue behind a saturated one
+        index = models.index(chosen)
+        while index > 0 and estimates[index][3] >= self.overload_depth:
+            index -= 1
+        return models[index]
+
+    def planner_for(self, task, method, latency_slo=None, queue_depth=None, **kwargs):
+        """
+        Return a planner instance for the routed model, choosing only among planners that
+        implement `method` (e.g. "generate_project_plan"). None if no planner does.
+        The planner tags its scheduler jobs with `task`, so their latency feeds the profile.
+        """
+        models = tuple(m for m in MODELS if callable(getattr(PLANNERS[m], method, None)))
+        if not models:
+            return None
+        model = self.choose(task, latency_slo=latency_slo, queue_depth=queue_depth, models=models)
+        return PLANNERS[model](model_name=model, task=task, **kwargs)
+
+    def observe(self, model, task, latency):
+        """Fold an observed request latency into the profile."""
+        if model not in self.profile or task not in self.quality_bar:
+            return
+        with self._lock:
+            quality, mean = self.profile[model].get(task, DEFAULT_PROFILE[model][task])
+            self.profile[model][task] = (quality, (1 - EWMA_ALPHA) * mean + EWMA_ALPHA * latency)
+
+    def observe_job(self, model, task, seconds):
+        """Scheduler timing listener; answers served from the response cache say nothing about the model."""
+        if not served_from_cache():
+            self.observe(model, task, seconds)
+
+    # --------------------------
+    # Internals
+    # --------------------------
+    def _estimate(self, model, task, queue_depth):
+        """Return (quality, expected latency including queueing, load per slot) for a model."""
+        with self._lock:
+            quality, latency = self.profile[model].get(task, DEFAULT_PROFILE[model][task])
+        if isinstance(queue_depth, dict):
+            queued = queue_depth.get(model, 0)
+        elif queue_depth is not None:
+            queued = queue_depth
+        else:
+            scheduler = self.scheduler or get_scheduler()
+            queued = scheduler.depth(model=model) + scheduler.running(model)
+        slots = DEFAULT_MODEL_CONCURRENCY.get(model, 1)
+        load = queued / slots
+        return quality, latency * (1 + load), load
+
+
+# --------------------------
+# Shared instance
+# --------------------------
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Return the process-wide ModelRouter, creating it on first use."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter()
+            get_scheduler().on_job_timed(_router.observe_job)
+        return _router
@@ -0,0 +1,248 @@
+# ollama_client.py
+# Shared HTTP client for the local Ollama daemon.
+# All backend model classes delegate to this instead of spawning `ollama run` per prompt.
+
+import json
+import os
+import sqlite3
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Project_APP.APP.backend.llm_cache import LLMResponseCache, make_key, should_cache
+
+# --------------------------
+# Configuration
+# --------------------------
+DEFAULT_HOST = "http://127.0.0.1:11434"
+DEFAULT_TIMEOUT = 600  # seconds; large models on CPU can take minutes
+DEFAULT_KEEP_ALIVE = "5m"  # how long the daemon keeps a model resident after a call
+DEFAULT_POOL_SIZE = 10
+
+
+class OllamaError(RuntimeError):
+    """Raised when the Ollama daemon cannot be reached or returns an error."""
+
+
+def _normalize_host(host):
+    """Accept OLLAMA_HOST values with or without a scheme (e.g. '127.0.0.1:11434')."""
+    host = (host or DEFAULT_HOST).strip().rstrip("/")
+    if not host.startswith(("http://", "https://")):
+        host = f"http://{host}"
+    return host
+
+
+class OllamaClient:
+    """
+    Thin client for the Ollama HTTP API (/api/generate, /api/chat).
+
+    A single requests.Session is shared so calls reuse pooled keep-alive
+    connections, and the daemon keeps the model warm between prompts.
+    If a `cache` (LLMResponseCache) is given, generate() answers repeated
+    deterministic prompts (temperature 0 or a seed, or use_cache=True) from it
+    without touching the model.
+    """
+
+    def __init__(self, host=None, timeout=DEFAULT_TIMEOUT, keep_alive=DEFAULT_KEEP_ALIVE, pool_size=DEFAULT_POOL_SIZE, cache=None):
+        self.host = _normalize_host(host or os.getenv("OLLAMA_HOST"))
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path, payload, timeout=None):
+        url = f"{self.host}{path}"
+        try:
+            resp = self.session.post(url, json=payload, timeout=timeout or self.timeout)
+        except requests.RequestException as e:
+            raise OllamaError(f"Request to {url} failed: {e}") from e
+        if resp.status_code != 200:
+            raise OllamaError(f"Ollama returned {resp.status_code} for {path}: {resp.text[:200]}")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise OllamaError(f"Invalid JSON from {path}: {e}") from e
+
+    def _post_stream(self, path, payload, timeout=None):
+        """POST with stream=True and yield each NDJSON chunk as it arrives."""
+        url = f"{self.host}{path}"
+        try:
+            resp = self.session.post(url, json=payload, stream=True, timeout=timeout or self.timeout)
+        except requests.RequestException as e:
+            raise OllamaError(f"Request to {url} failed: {e}") from e
+        with resp:
+            if resp.status_code != 200:
+                raise OllamaError(f"Ollama returned {resp.status_code} for {path}: {resp.text[:200]}")
+            try:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as e:
+                        raise OllamaError(f"Invalid stream chunk from {path}: {e}") from e
+                    if chunk.get("error"):
+                        raise OllamaError(chunk["error"])
+                    yield chunk
+                    if chunk.get("done"):
+                        break
+            except requests.RequestException as e:
+                raise OllamaError(f"Stream from {url} interrupted: {e}") from e
+
+    def _generate_payload(self, model, prompt, stream, system=None, options=None, format=None, keep_alive=None):
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": keep_alive if keep_alive is not None else self.keep_alive,
+        }
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        return payload
+
+    def _chat_payload(self, model, messages, stream, options=None, format=None, keep_alive=None):
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": keep_alive if keep_alive is not None else self.keep_alive,
+        }
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        return payload
+
+    def cache_key(self, model, prompt, system=None, options=None, format=None, template_version="1", use_cache=None):
+        """Response-cache key for a generate request, or None if it would not be cached."""
+        if self.cache is None or not should_cache(options, use_cache):
+            return None
+        params = {"system": system, "options": options, "format": format}
+        return make_key(model, prompt, template_version=template_version, params=params)
+
+    def generate(self, model, prompt, system=None, options=None, format=None, keep_alive=None, timeout=None,
+                 template_version="1", use_cache=None):
+        """Run a single prompt and return the full response text."""
+        key = self.cache_key(model, prompt, system, options, format, template_version, use_cache)
+        _last_call.cached = False
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                _last_call.cached = True
+                return cached
+        payload = self._generate_payload(model, prompt, False, system, options, format, keep_alive)
+        data = self._post("/api/generate", payload, timeout=timeout)
+        response = data.get("response", "")
+        if key is not None and response:
+            self.cache.put(key, model, response)
+        return response
+
+    def stream_generate(self, model, prompt, system=None, options=None, format=None, keep_alive=None, timeout=None,
+                        template_version="1", use_cache=None):
+        """Yield response text fragments as the model produces them."""
+        key = self.cache_key(model, prompt, system, options, format, template_version, use_cache)
+        _last_call.cached = False
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                _last_call.cached = True
+                yield cached
+                return
+        payload = self._generate_payload(model, prompt, True, system, options, format, keep_alive)
+        parts = []
+        for chunk in self._post_stream("/api/generate", payload, timeout=timeout):
+            token = chunk.get("response", "")
+            if token:
+                parts.append(token)
+                yield token
+        # Only complete streams are cached; an abandoned generator never reaches this point
+        if key is not None and parts:
+            self.cache.put(key, model, "".join(parts))
+
+    def chat(self, model, messages, options=None, format=None, keep_alive=None, timeout=None):
+        """Run a chat exchange (list of {'role', 'content'} dicts) and return the assistant reply."""
+        payload = self._chat_payload(model, messages, False, options, format, keep_alive)
+        data = self._post("/api/chat", payload, timeout=timeout)
+        return data.get("message", {}).get("content", "")
+
+    def stream_chat(self, model, messages, options=None, format=None, keep_alive=None, timeout=None):
+        """Yield assistant reply fragments as the model produces them."""
+        payload = self._chat_payload(model, messages, True, options, format, keep_alive)
+        for chunk in self._post_stream("/api/chat", payload, timeout=timeout):
+            token = chunk.get("message", {}).get("content", "")
+            if token:
+                yield token
+
+    def list_models(self):
+        """Return the names of models available on the daemon."""
+        try:
+            resp = self.session.get(f"{self.host}/api/tags", timeout=10)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise OllamaError(f"Failed to list models: {e}") from e
+        return [m.get("name", "") for m in resp.json().get("models", [])]
+
+    def load_model(self, model, keep_alive=None, timeout=None):
+        """Load a model into memory without generating (an empty prompt only warms it up)."""
+        self._post("/api/generate", {
+            "model": model,
+            "keep_alive": keep_alive if keep_alive is not None else self.keep_alive,
+        }, timeout=timeout)
+
+    def unload_model(self, model):
+        """Ask the daemon to release a model's memory now."""
+        self._post("/api/generate", {"model": model, "keep_alive": 0}, timeout=30)
+
+    def running_models(self):
+        """Return {name: size_in_bytes} for the models currently resident in the daemon."""
+        try:
+            resp = self.session.get(f"{self.host}/api/ps", timeout=10)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise OllamaError(f"Failed to list running models: {e}") from e
+        return {m.get("name", ""): m.get("size", 0) for m in resp.json().get("models", [])}
+
+    def close(self):
+        self.session.close()
+
+
+# --------------------------
+# Shared instance
+# --------------------------
+_last_call = threading.local()
+_client = None
+_client_lock = threading.Lock()
+
+
+def served_from_cache():
+    """True if the last generate on this thread was answered from the response cache, not the model."""
+    return getattr(_last_call, "cached", False)
+
+
+def get_client():
+    """Return the process-wide OllamaClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            try:
+                cache = LLMResponseCache()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[LLM] Response cache unavailable, continuing without it: {e}")
+                cache = None
+            _client = OllamaClient(cache=cache)
+        return _client
+
+
+def set_client(client):
+    """Replace the shared client (e.g. to point at a FakeOllamaServer)."""
+    global _client
+    with _client_lock:
+        _client = client
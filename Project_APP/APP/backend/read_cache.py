@@ -0,0 +1,140 @@
+# read_cache.py
+# Small in-process read-through cache for database rows.
+# Entries are bounded (LRU), expire after a TTL, and carry tags ("user:3", "project:7",
+# "table:users") so a writer can drop exactly the entries that depend on what it changed.
+# A load that overlaps an invalidation of one of its tags is not cached: it may have read the
+# rows from before the write.
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReadCache:
+    """Thread-safe LRU + TTL cache with tag-based invalidation and hit/miss stats."""
+
+    def __init__(self, max_entries=2000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set(keys)
+        self._epoch = 0  # bumped by every invalidation
+        self._invalidated_at = {}  # tag -> epoch of its last invalidation (kept while loads run)
+        self._cleared_at = 0
+        self._loads = {}  # start epoch -> number of loads in flight that started then
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, tags=(), since=None):
+        """Cache value under key. With `since` (an epoch from begin_load), skip it if any of its
+        tags was invalidated after that point."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if since is not None and (
+                self._cleared_at > since or any(self._invalidated_at.get(tag, -1) > since for tag in tags)
+            ):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, tags=()):
+        """Return the cached value for `key`, or call loader() -> (value, tags) and cache it.
+        None results are not cached."""
+        marker = object()
+        value = self.get(key, marker)
+        if value is not marker:
+            return value
+        since = self.begin_load()
+        try:
+            value, loaded_tags = loader()
+            if value is not None:
+                self.put(key, value, tuple(tags) + tuple(loaded_tags), since=since)
+        finally:
+            self.end_load(since)
+        return value
+
+    def begin_load(self):
+        """Mark the start of a load; returns the epoch to pass to put(since=...) and end_load."""
+        with self._lock:
+            self._loads[self._epoch] = self._loads.get(self._epoch, 0) + 1
+            return self._epoch
+
+    def end_load(self, since):
+        with self._lock:
+            self._loads[since] -= 1
+            if not self._loads[since]:
+                del self._loads[since]
+            if not self._loads:
+                self._invalidated_at.clear()  # no load can be affected by older invalidations
+
+    def invalidate(self, key):
+        # Untagged: a load of this key that is in flight may still cache what it read
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_tags(self, tags):
+        """Drop every entry carrying any of `tags`, and keep loads in flight from caching them."""
+        with self._lock:
+            self._epoch += 1
+            for tag in tags:
+                if self._loads:
+                    self._invalidated_at[tag] = self._epoch
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._cleared_at = self._epoch
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
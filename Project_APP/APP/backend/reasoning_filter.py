@@ -0,0 +1,118 @@
+# reasoning_filter.py
+# Separates deepseek-r1 reasoning traces (<think>...</think>) from the answer as tokens arrive,
+# so callers only buffer, log and parse the answer. Tags split across chunks are handled.
+
+OPEN_TAG = "<think>"
+CLOSE_TAG = "</think>"
+
+
+def _partial_suffix(text, tag):
+    """Length of the longest suffix of `text` that is a proper prefix of `tag`."""
+    for n in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:n]):
+            return n
+    return 0
+
+
+class ReasoningFilter:
+    """
+    Incremental splitter for model output.
+
+    feed(chunk) returns the answer text contained in the chunk (possibly ""); call flush()
+    at the end of the stream. Reasoning is dropped unless `keep_trace` is set, in which case
+    it accumulates in `trace`; `on_reasoning(text)` receives it as it arrives either way.
+    `answer_started` flips (and `on_answer_start()` fires) on the first answer character.
+
+    Set `starts_in_reasoning` for models whose template pre-fills the opening <think>.
+    """
+
+    def __init__(self, keep_trace=False, on_reasoning=None, on_answer_start=None, starts_in_reasoning=False):
+        self.keep_trace = keep_trace
+        self.on_reasoning = on_reasoning
+        self.on_answer_start = on_answer_start
+        self.in_reasoning = starts_in_reasoning
+        self.answer_started = False
+        self.trace = ""
+        self.trace_chars = 0
+        self._pending = ""
+        self._at_start = not starts_in_reasoning  # only a leading <think> opens a trace
+
+    def feed(self, chunk):
+        text = self._pending + (chunk or "")
+        self._pending = ""
+        answer = []
+        while text:
+            if self.in_reasoning:
+                end = text.find(CLOSE_TAG)
+                if end == -1:
+                    hold = _partial_suffix(text, CLOSE_TAG)
+                    self._reasoning(text[:len(text) - hold])
+                    self._pending = text[len(text) - hold:]
+                    break
+                self._reasoning(text[:end])
+                text = text[end + len(CLOSE_TAG):].lstrip()
+                self.in_reasoning = False
+                self._at_start = False
+                if not text:
+                    # Leading whitespace of the answer may still be coming; keep stripping it
+                    self._at_start = True
+                continue
+            if self._at_start:
+                stripped = text.lstrip()
+                if not stripped:
+                    break  # whitespace only so far; wait for more
+                if stripped.startswith(OPEN_TAG):
+                    self.in_reasoning = True
+                    self._at_start = False
+                    text = stripped[len(OPEN_TAG):]
+                    continue
+                if OPEN_TAG.startswith(stripped):
+                    self._pending = stripped  # could still become <think>
+                    break
+                self._at_start = False
+                text = stripped
+            answer.append(text)
+            break
+        return self._answer("".join(answer))
+
+    def flush(self):
+        """Return any held-back text at the end of the stream."""
+        text, self._pending = self._pending, ""
+        if self.in_reasoning:
+            self._reasoning(text)
+            return ""
+        return self._answer(text)
+
+    def _reasoning(self, text):
+        if not text:
+            return
+        self.trace_chars += len(text)
+        if self.keep_trace:
+            self.trace += text
+        if self.on_reasoning:
+            self.on_reasoning(text)
+
+    def _answer(self, text):
+        if text and not self.answer_started:
+            self.answer_started = True
+            if self.on_answer_start:
+                self.on_answer_start()
+        return text
+
+
+def filter_stream(tokens, **kwargs):
+    """Wrap a token iterator and yield only answer text. kwargs go to ReasoningFilter."""
+    f = ReasoningFilter(**kwargs)
+    for token in tokens:
+        answer = f.feed(token)
+        if answer:
+            yield answer
+    tail = f.flush()
+    if tail:
+        yield tail
+
+
+def strip_reasoning(text):
+    """Return the answer part of a complete response."""
+    f = ReasoningFilter()
+    return (f.feed(text) + f.flush()).strip()
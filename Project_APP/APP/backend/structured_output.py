@@ -0,0 +1,188 @@
+# structured_output.py
+# JSON-constrained generation.
+# The model is asked for JSON through Ollama's `format` (a JSON schema or "json"), the stream is
+# parsed as it arrives and closed as soon as the top-level value is complete, and truncated output
+# is repaired locally before spending a second model call on a re-prompt.
+
+import json
+
+from Project_APP.APP.backend.reasoning_filter import ReasoningFilter
+
+REPROMPT_SUFFIX = "\n\nRespond with valid JSON only. Do not include any other text."
+
+
+class IncrementalJSONParser:
+    """
+    Tracks bracket depth over streamed text and reports when the first top-level JSON
+    object or array is closed. Text before the opening bracket is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.complete = False
+        self._started = False
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Consume a chunk; returns True once the top-level value has closed."""
+        for ch in chunk:
+            if self.complete:
+                break
+            if not self._started:
+                if ch not in "{[":
+                    continue
+                self._started = True
+            self.buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append("}" if ch == "{" else "]")
+            elif ch in "}]":
+                if self._stack and self._stack[-1] == ch:
+                    self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+        return self.complete
+
+    @property
+    def text(self):
+        return "".join(self.buffer)
+
+
+def repair_json(text):
+    """
+    Best-effort fix for truncated JSON: close an open string, drop a dangling key or trailing
+    comma, and close open brackets. Returns the parsed value or None.
+    """
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    if start == -1:
+        return None
+    text = text[start:]
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    # Walk back through cut points (after each complete element) until something parses
+    cuts = [len(text)]
+    stack, in_string, escape = [], False, False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+            cuts.append(i + 1)
+        elif ch == ",":
+            cuts.append(i)
+    for cut in sorted(set(cuts), reverse=True):
+        candidate = _close(text[:cut])
+        if candidate is None:
+            continue
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return None
+
+
+def _close(fragment):
+    """Append whatever is needed to close strings and brackets left open in `fragment`."""
+    stack, in_string, escape = [], False, False
+    for ch in fragment:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not stack:
+                return None
+            stack.pop()
+    if in_string:
+        fragment += '"'
+    fragment = fragment.rstrip().rstrip(",")
+    if fragment.endswith(":"):
+        fragment += " null"
+    return fragment + "".join(reversed(stack))
+
+
+def matches_schema(value, schema):
+    """Shallow check of the top-level type and required keys of a JSON schema."""
+    if not isinstance(schema, dict):
+        return value is not None
+    expected = schema.get("type")
+    if expected == "object" and not isinstance(value, dict):
+        return False
+    if expected == "array" and not isinstance(value, list):
+        return False
+    if isinstance(value, dict):
+        return all(key in value for key in schema.get("required", []))
+    return True
+
+
+def generate_structured(client, model, prompt, schema=None, system=None, options=None, template_version="1",
+                        reprompts=1, keep_alive=None, use_cache=None):
+    """
+    Generate JSON from `model` and return the parsed value, or None if every attempt failed.
+
+    `schema` is passed to Ollama as the output format (plain "json" mode if omitted).
+    Generation stops as soon as the top-level value closes; <think> traces are skipped.
+    """
+    format = schema or "json"
+    attempt_prompt = prompt
+    for attempt in range(reprompts + 1):
+        parser = IncrementalJSONParser()
+        reasoning = ReasoningFilter()
+        stream = client.stream_generate(model, attempt_prompt, system=system, options=options, format=format,
+                                        keep_alive=keep_alive, template_version=template_version, use_cache=use_cache)
+        try:
+            for token in stream:
+                if parser.feed(reasoning.feed(token)):
+                    break  # top-level value closed: stop generating
+            else:
+                parser.feed(reasoning.flush())
+        finally:
+            stream.close()  # aborts the HTTP stream if we stopped early
+        value = None
+        if parser.complete:
+            try:
+                value = json.loads(parser.text)
+            except ValueError:
+                pass
+        if value is None:
+            value = repair_json(parser.text)
+        if value is not None and matches_schema(value, schema):
+            # Early-stopped streams are not cached by the client; store the closed value here
+            key = client.cache_key(model, attempt_prompt, system=system, options=options, format=format,
+                                   template_version=template_version, use_cache=use_cache)
+            if parser.complete and key is not None:
+                client.cache.put(key, model, parser.text)
+            return value
+        print(f"[LLM] {model} returned unusable JSON (attempt {attempt + 1})")
+        attempt_prompt = prompt + REPROMPT_SUFFIX
+    return None
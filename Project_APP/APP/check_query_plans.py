@@ -0,0 +1,165 @@
+# check_query_plans.py: EXPLAIN QUERY PLAN regression check for the public query functions in db.py.
+#
+# Builds a throwaway database seeded at scale, runs each query function while capturing the SQL
+# it emits, and fails (exit code 1) if any statement scans a large table without an index.
+#
+#   python -m Project_APP.APP.check_query_plans
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Never touch the real auth.db
+_TMP_DIR = tempfile.mkdtemp(prefix="query_plans_")
+os.environ["AUTH_DB_PATH"] = os.path.join(_TMP_DIR, "plans.db")
+os.environ.pop("DATABASE_URL", None)  # EXPLAIN QUERY PLAN is SQLite's
+os.environ["DB_CACHE_SIZE"] = "0"  # every call must reach the database
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, event, text
+
+from Project_APP.APP import db, read_models
+
+ROWS = 5000  # per table; enough for the planner to prefer indexes once ANALYZE has run
+
+# Tables that grow with usage; a plain "SCAN <table>" on these is a regression
+LARGE_TABLES = {
+    "users", "projects", "project_members", "tasks", "subtasks", "files",
+    "messages", "event_logs", "refresh_tokens", "eisenhower_matrix_states", "task_dependencies",
+    "project_stats", "event_log_rollups",
+}
+
+# (label, callable) for every public read path; arguments point at seeded rows
+QUERIES = [
+    ("get_tasks", lambda: db.get_tasks(1)),
+    ("get_user_tasks", lambda: db.get_user_tasks(1)),
+    ("get_user_subtasks", lambda: db.get_user_subtasks(1)),
+    ("get_task_by_id", lambda: db.get_task_by_id(1)),
+    ("get_subtasks", lambda: db.get_subtasks(1)),
+    ("get_subtask_by_id", lambda: db.get_subtask_by_id(1)),
+    ("get_user_messages", lambda: db.get_user_messages(1)),
+    ("get_files", lambda: db.get_files(1, task_id=1)),
+    ("get_file_by_id", lambda: db.get_file_by_id(1)),
+    ("get_user_by_username", lambda: db.get_user_by_username("username_1")),
+    ("get_user_by_id", lambda: db.get_user_by_id(1)),
+    ("validate_refresh_token", lambda: db.validate_refresh_token("token_1")),
+    ("cleanup_expired_tokens", lambda: db.cleanup_expired_tokens()),
+    ("get_user_projects", lambda: db.get_user_projects(1)),
+    ("list_user_projects", lambda: db.list_user_projects(1, after=("name_1", 1), with_total=True)),
+    ("get_project_by_id", lambda: db.get_project_by_id(1, user_id=1)),
+    ("get_project_members", lambda: db.get_project_members(1, user_id=1)),
+    ("get_project_statistics", lambda: db.get_project_statistics(1, user_id=1)),
+    ("get_event_logs(project)", lambda: db.get_event_logs(project_id=1)),
+    ("get_event_logs(user)", lambda: db.get_event_logs(user_id=1)),
+    ("get_event_logs(project, user)", lambda: db.get_event_logs(project_id=1, user_id=1)),
+    ("get_event_activity", lambda: db.get_event_activity(project_id=1, since=datetime.utcnow() - timedelta(days=30))),
+    ("get_eisenhower_matrix_state", lambda: db.get_eisenhower_matrix_state(1, 1)),
+    ("get_dependencies", lambda: db.get_dependencies("task", 1)),
+    ("get_dependents", lambda: db.get_dependents("task", 1)),
+    ("get_transitive_dependencies", lambda: db.get_transitive_dependencies("task", 1)),
+    ("get_transitive_dependencies(reverse)", lambda: db.get_transitive_dependencies("task", 1, reverse=True)),
+    ("get_project_dependency_edges", lambda: db.get_project_dependency_edges(1)),
+    ("search", lambda: db.search(1, "title")),
+    ("list_user_projects(search)", lambda: db.list_user_projects(1, search="name")),
+    ("read_models.list_project_summaries", lambda: read_models.list_project_summaries(1)),
+    ("read_models.load_project_detail", lambda: read_models.load_project_detail(1, user_id=1)),
+    ("read_models.load_project_schedule", lambda: read_models.load_project_schedule(1)),
+    ("read_models.load_task", lambda: read_models.load_task(1)),
+    ("read_models.load_subtask_detail", lambda: read_models.load_subtask_detail(1)),
+    ("read_models.load_project_members", lambda: read_models.load_project_members(1, user_id=1)),
+]
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def _value(column, i):
+    """Deterministic value for a seeded column."""
+    if isinstance(column.type, Integer):
+        return (i % ROWS) + 1 if column.foreign_keys else i
+    if isinstance(column.type, DateTime):
+        return datetime.utcnow() + timedelta(minutes=i - ROWS // 2)
+    if isinstance(column.type, Date):
+        return (datetime.utcnow() + timedelta(days=i - ROWS // 2)).date()
+    if isinstance(column.type, Boolean):
+        return False
+    if isinstance(column.type, Float):
+        return 1.0
+    return f"{column.name}_{i}"
+
+
+def seed():
+    db.Base.metadata.create_all(bind=db.engine)
+    db.create_search_index()  # triggers index the seeded rows
+    with db.engine.begin() as conn:
+        for table in db.Base.metadata.sorted_tables:
+            pk = [c for c in table.columns if c.primary_key]
+            rows = []
+            for i in range(1, ROWS + 1):
+                row = {}
+                for column in table.columns:
+                    if column.primary_key and len(pk) == 1:
+                        row[column.name] = i
+                    elif column.primary_key:
+                        # Composite keys: spread the second component so pairs stay unique
+                        n = i if column is pk[0] else (i * 7) % ROWS + 1
+                        row[column.name] = n if isinstance(column.type, Integer) else _value(column, n)
+                    else:
+                        row[column.name] = _value(column, i)
+                rows.append(row)
+            conn.execute(table.insert(), rows)
+        conn.execute(text("ANALYZE"))
+
+
+def capture(fn):
+    """Run fn and return the (statement, parameters) pairs it executed."""
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+    return statements
+
+
+def full_scans(statement, parameters):
+    """Return the large tables the statement reads without an index."""
+    with db.engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in plan:
+        m = _FULL_SCAN.match(row[-1])
+        if m and m.group(1) in LARGE_TABLES:
+            scans.append(m.group(1))
+    return scans
+
+
+def main():
+    seed()
+    failures = 0
+    for label, fn in QUERIES:
+        problems = []
+        for statement, parameters in capture(fn):
+            for table in full_scans(statement, parameters):
+                problems.append(f"full scan of {table}: {' '.join(statement.split())[:160]}")
+        if problems:
+            failures += 1
+            print(f"[FAIL] {label}")
+            for p in problems:
+                print(f"       {p}")
+        else:
+            print(f"[OK]   {label}")
+    db.engine.dispose()
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+    print(f"{len(QUERIES) - failures}/{len(QUERIES)} query functions use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# event_retention.py: age out event_logs rows into compressed monthly archives.
+#
+# Each event type has a retention period. Rows older than it are moved in small batches. A batch
+# is appended to a gzip JSON-lines file per month (event_archive/event_logs-YYYY-MM.jsonl.gz).
+# In the same short transaction, its daily counts are added to event_log_rollups and the rows are
+# deleted, so no batch holds the write lock for more than a few milliseconds, and
+# get_event_activity stays exact after the rows are gone. The archive is written before the
+# delete commits. A crash in between can therefore archive a row twice; read_archive drops
+# duplicate ids.
+#
+#   python -m Project_APP.APP.event_retention              # archive everything due, in every tenant database
+#   python -m Project_APP.APP.event_retention --dry-run    # show what is due (main database)
+#   python -m Project_APP.APP.event_retention --status     # rows, oldest event and policy per type
+#   python -m Project_APP.APP.event_retention --vacuum     # archive, then VACUUM (exclusive lock)
+
+import glob
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import OperationalError
+
+from Project_APP.APP import db
+from Project_APP.APP.db import EventLog, EventLogRollup
+
+# --------------------------
+# Configuration
+# --------------------------
+# Days an event type stays in event_logs; None keeps it forever. llm_suggestion rows carry the
+# full prompt and response in context_json, so they go first.
+DEFAULT_POLICIES = {
+    "llm_suggestion": 90,
+    "recategorization": 365,
+    "project_member_assigned": 730,
+}
+DEFAULT_RETENTION_DAYS = int(os.getenv("EVENT_RETENTION_DEFAULT_DAYS", "365"))
+ARCHIVE_DIR = os.getenv("EVENT_ARCHIVE_DIR", os.path.join(os.path.dirname(db.DB_PATH), "event_archive"))
+BATCH_SIZE = 500
+BATCH_PAUSE = 0.05  # seconds between batches so interactive writers get the lock
+RETENTION_INTERVAL = float(os.getenv("EVENT_RETENTION_INTERVAL", str(6 * 3600)))  # 0 disables the worker
+
+
+def _parse_policies(spec):
+    """Parse "llm_suggestion=30,recategorization=keep" into {event_type: days or None}."""
+    policies = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            event_type, days = (x.strip() for x in part.split("=", 1))
+            if days.lower() == "keep":
+                policies[event_type] = None
+            elif days.isdigit():
+                policies[event_type] = int(days)
+    return policies
+
+
+POLICIES = {**DEFAULT_POLICIES, **_parse_policies(os.getenv("EVENT_RETENTION_POLICIES"))}
+
+
+def retention_days(event_type):
+    return POLICIES.get(event_type, DEFAULT_RETENTION_DAYS)
+
+
+# --------------------------
+# Archive files
+# --------------------------
+def _archive_dir():
+    """ARCHIVE_DIR, or its tenant_<id> subdirectory for a tenant with its own database."""
+    tenant_id = db.current_tenant() if db.TENANT_DB_DIR else None
+    return ARCHIVE_DIR if tenant_id is None else os.path.join(ARCHIVE_DIR, f"tenant_{tenant_id}")
+
+
+def _archive_path(month):
+    return os.path.join(_archive_dir(), f"event_logs-{month}.jsonl.gz")
+
+
+def _row_dict(row):
+    data = dict(row._mapping)
+    data["timestamp"] = row.timestamp.isoformat() if row.timestamp else None
+    return data
+
+
+def _write_archive(rows):
+    """Append rows to their monthly files (one gzip member per batch) and fsync them."""
+    os.makedirs(_archive_dir(), exist_ok=True)
+    by_month = {}
+    for row in rows:
+        month = row.timestamp.strftime("%Y-%m") if row.timestamp else "undated"
+        by_month.setdefault(month, []).append(row)
+    for month, month_rows in by_month.items():
+        with open(_archive_path(month), "ab") as f:
+            payload = "".join(json.dumps(_row_dict(r), default=str) + "\n" for r in month_rows)
+            f.write(gzip.compress(payload.encode("utf-8")))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def archive_months():
+    """Months that have an archive file, oldest first."""
+    return sorted(os.path.basename(p)[len("event_logs-"):-len(".jsonl.gz")]
+                  for p in glob.glob(_archive_path("*")))
+
+
+def read_archive(month, event_type=None, project_id=None):
+    """Yield archived events of one month ("YYYY-MM") as dicts, optionally filtered."""
+    path = _archive_path(month)
+    if not os.path.exists(path):
+        return
+    seen = set()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["id"] in seen:
+                continue
+            seen.add(entry["id"])
+            if event_type is not None and entry["event_type"] != event_type:
+                continue
+            if project_id is not None and entry["project_id"] != project_id:
+                continue
+            yield entry
+
+
+# --------------------------
+# Retention
+# --------------------------
+def _event_types(conn):
+    return list(conn.execute(select(EventLog.event_type).distinct()).scalars())
+
+
+def _due(event_type, now):
+    """WHERE clause for rows of event_type past retention, or None when the type is kept forever."""
+    days = retention_days(event_type)
+    if days is None:
+        return None
+    return (EventLog.event_type == event_type) & (EventLog.timestamp < now - timedelta(days=days))
+
+
+def _archive_batch(event_type, where, batch_size):
+    """Move one batch; returns the number of rows moved (0 when nothing is due)."""
+    with db.tenant_engine().begin() as conn:
+        rows = conn.execute(
+            select(EventLog.__table__).where(where).order_by(EventLog.timestamp, EventLog.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return 0
+        _write_archive(rows)
+        counts = {}
+        for row in rows:
+            key = (row.timestamp.date(), row.project_id or 0)
+            counts[key] = counts.get(key, 0) + 1
+        conn.execute(db.counter_upsert(EventLogRollup.__table__, "count"), [
+            {"day": day, "event_type": event_type, "project_id": project_id, "count": count}
+            for (day, project_id), count in counts.items()
+        ])
+        conn.execute(delete(EventLog).where(EventLog.id.in_([row.id for row in rows])))
+    return len(rows)
+
+
+def run_retention(now=None, batch_size=BATCH_SIZE, pause=BATCH_PAUSE, stop=None):
+    """Archive every row past its retention period. Returns {event_type: rows moved}."""
+    now = now or datetime.utcnow()
+    db.flush_event_log()
+    moved = {}
+    try:
+        with db.tenant_engine().connect() as conn:
+            event_types = _event_types(conn)
+        for event_type in event_types:
+            where = _due(event_type, now)
+            if where is None:
+                continue
+            retries = 0
+            while not (stop and stop.is_set()):
+                try:
+                    count = _archive_batch(event_type, where, batch_size)
+                except OperationalError:
+                    # Another writer committed between our read and delete (SQLite busy); the
+                    # batch rolled back, so try it again shortly
+                    retries += 1
+                    if retries > 3:
+                        raise
+                    time.sleep(pause * 10)
+                    continue
+                if not count:
+                    break
+                moved[event_type] = moved.get(event_type, 0) + count
+                time.sleep(pause)
+    except Exception as e:
+        db.log_error(f"Error archiving event logs: {e}")
+    if moved:
+        db.log_event(f"Archived {sum(moved.values())} event log rows of tenant {db.current_tenant()}: {moved}")
+    return moved
+
+
+def run_retention_all_tenants(stop=None):
+    """run_retention on the main database and every tenant database. Returns {tenant_id: moved}."""
+    moved = {}
+    for tenant_id in db.tenant_ids():
+        if stop and stop.is_set():
+            break
+        with db.tenant_scope(tenant_id):
+            moved[tenant_id] = run_retention(stop=stop)
+    return moved
+
+
+def due_counts(now=None):
+    """{event_type: rows past retention} without moving anything."""
+    now = now or datetime.utcnow()
+    db.flush_event_log()
+    due = {}
+    with db.tenant_engine().connect() as conn:
+        for event_type in _event_types(conn):
+            where = _due(event_type, now)
+            if where is not None:
+                count = conn.execute(select(func.count()).select_from(EventLog).where(where)).scalar()
+                if count:
+                    due[event_type] = count
+    return due
+
+
+def retention_status():
+    """Per event type: live rows, oldest timestamp and retention days."""
+    db.flush_event_log()
+    with db.tenant_engine().connect() as conn:
+        rows = conn.execute(
+            select(EventLog.event_type, func.count(), func.min(EventLog.timestamp)).group_by(EventLog.event_type)
+        ).all()
+    return [
+        {"event_type": event_type, "rows": count, "oldest": oldest, "retention_days": retention_days(event_type)}
+        for event_type, count, oldest in rows
+    ]
+
+
+# --------------------------
+# Background worker
+# --------------------------
+class RetentionWorker:
+    """Runs run_retention every `interval` seconds on a daemon thread."""
+
+    def __init__(self, interval=RETENTION_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        # First pass shortly after startup, so it does not compete with loading the UI
+        delay = min(60, self.interval)
+        while not self._stop.wait(delay):
+            run_retention_all_tenants(stop=self._stop)
+            delay = self.interval
+
+
+_worker = None
+
+
+def start_retention_worker():
+    """Start the process-wide RetentionWorker (no-op when EVENT_RETENTION_INTERVAL=0)."""
+    global _worker
+    if _worker is None and RETENTION_INTERVAL > 0:
+        import atexit
+        _worker = RetentionWorker()
+        atexit.register(_worker.stop)
+    return _worker
+
+
+if __name__ == "__main__":
+    if "--status" in sys.argv:
+        for entry in retention_status():
+            days = entry["retention_days"]
+            print(f"{entry['event_type']:<28} {entry['rows']:>8} rows  oldest {entry['oldest']}  "
+                  f"keep {'forever' if days is None else f'{days} days'}")
+        print(f"Archived months: {', '.join(archive_months()) or 'none'}")
+    elif "--dry-run" in sys.argv:
+        due = due_counts()
+        for event_type, count in sorted(due.items()):
+            print(f"{event_type:<28} {count:>8} rows due")
+        print(f"{sum(due.values())} row(s) would be archived to {ARCHIVE_DIR}")
+    else:
+        moved = run_retention_all_tenants()
+        print(f"Archived {sum(sum(m.values()) for m in moved.values())} row(s) to {ARCHIVE_DIR}")
+        if "--vacuum" in sys.argv and db.engine.dialect.name == "sqlite":
+            for tenant_id in db.tenant_ids():
+                with db.tenant_engine(tenant_id).connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    conn.execute(text("VACUUM"))
+            print("Database vacuumed.")
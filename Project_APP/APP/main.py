@@ -13,31 +13,30 @@ from Project_APP.APP.db import (
     Project,
     Task,
     authenticate_user,
-    get_user_projects,
     get_event_logs,
     update_subtask_category,
-    log_structured_event
+    log_structured_event,
+    set_current_tenant
 )
 from sqlalchemy.orm import joinedload
 from PySide6.QtCore import QObject, Signal, Slot, Property
 # (import moved above with diagnostics)
 
+from Project_APP.APP.backend import app_logging
+
+_ui_log = app_logging.get_logger("ui")
+
 def log_event(event):
-    """Append event messages to the event log with timestamp and print to terminal."""
-    LOG_FILE = "event_log.txt"
+    """Queue an event message for the app log and print to terminal."""
     timestamp = datetime.datetime.now().isoformat()
     print(f"[{timestamp}] {event}")
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {event}\n")
+    _ui_log.info(event)
 
 def log_error(error_msg):
-    """Append error messages to the event log and print to stderr."""
-    LOG_FILE = "event_log.txt"
+    """Queue an error message for the app log and print to terminal."""
     timestamp = datetime.datetime.now().isoformat()
-    full_msg = f"[ERROR] [{timestamp}] {error_msg}"
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(full_msg + "\n")
-    print(full_msg)
+    print(f"[ERROR] [{timestamp}] {error_msg}")
+    _ui_log.error(error_msg)
 # 
 # from PySide6.QtCore import QObject, Signal, Property
 # 
@@ -143,16 +142,14 @@ class EventLogBridge(QObject):
     @Slot()
     def load_log(self):
         try:
-            with open("event_log.txt", "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            # Read from the in-memory ring buffer; most recent at top
             parsed = []
-            for line in lines:
-                if line.startswith("[") and "]" in line:
-                    ts_end = line.find("]")
-                    timestamp = line[1:ts_end]
-                    description = line[ts_end+2:].strip()
-                    parsed.append(EventLogEntry(timestamp, description))
-            self._event_log = list(reversed(parsed[-200:]))  # Most recent at top
+            for entry in app_logging.recent(200):
+                description = entry.get("msg", "")
+                if entry.get("level") == "ERROR":
+                    description = f"[ERROR] {description}"
+                parsed.append(EventLogEntry(entry.get("ts", ""), description))
+            self._event_log = parsed
             self.eventLogChanged.emit()
         except Exception:
             self._event_log = []
@@ -206,6 +203,8 @@ class AuthManager(QObject):
         global_loading_manager.progress = 0.7
         if user:
             self._user = user
+            # Route every later database call to this user's tenant database
+            set_current_tenant(getattr(user, "tenant_id", None))
             self.userIdChanged.emit()
             log_event(f"User '{username}' logged in")
             self.loginResult.emit(True, "Login successful")
@@ -234,14 +233,37 @@ class AuthManager(QObject):
             except Exception:
                 return 0
         return 0
+
+EISENHOWER_CONTEXT_CANDIDATES = 200  # history rows ranked for the prompt; the budget decides how many are sent
+EISENHOWER_WAIT_TIMEOUT = 30  # seconds to wait for a suggestion, queueing included
+EISENHOWER_PROMPT = (
+    "You are an assistant that classifies tasks into the Eisenhower Matrix. The four quadrants are: "
+    "important_urgent (Urgent & Important), important (Not Urgent & Important), "
+    "urgent (Urgent & Not Important), other (Not Urgent & Not Important).\n"
+    "Recent category changes in this project: {context}\n"
+    "Return ONLY a JSON object with two fields: \"suggested_category\" (one of the four quadrant names) "
+    "and \"reasoning\" (one sentence).\n"
+    "Task: \"{title}\" {description}"
+)
+EISENHOWER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "suggested_category": {"type": "string", "enum": ["important_urgent", "important", "urgent", "other"]},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["suggested_category", "reasoning"],
+}
+
 class DashboardManager(QObject):
     projectsChanged = Signal()
     eisenhowerMatrixStateChanged = Signal()
+    _eisenhowerSuggestionDone = Signal(int, int)  # user_id, project_id; reloads state on the UI thread
 
     def __init__(self):
         super().__init__()
         self._projects = []
         self._eisenhower_matrix_state = {}
+        self._eisenhowerSuggestionDone.connect(self.loadEisenhowerMatrixState)
 
     @Slot(int)
     def loadProjects(self, user_id):
@@ -249,12 +271,17 @@ class DashboardManager(QObject):
         global_loading_manager.loading = True
         global_loading_manager.progress = 0.1
         try:
-            projects, _ = get_user_projects(user_id)
+            # Summary rows only: the sidebar needs id, name, description and deadline
+            from Project_APP.APP.read_models import list_project_summaries
+            projects = list_project_summaries(user_id)
             global_loading_manager.progress = 0.5
             print(f"[DEBUG] loadProjects: user_id={user_id}, projects_found={len(projects)}")
             for p in projects:
-                print(f"[DEBUG] Project loaded: id={getattr(p, 'id', None)}, name={getattr(p, 'name', None)}")
-            self._projects = [self._project_to_dict(p) for p in projects]
+                print(f"[DEBUG] Project loaded: id={p.id}, name={p.name}")
+            self._projects = [
+                {"id": p.id, "name": p.name, "description": p.description or "", "deadline": p.deadline or ""}
+                for p in projects
+            ]
             global_loading_manager.progress = 0.9
             self.projectsChanged.emit()
         except Exception as e:
@@ -306,23 +333,6 @@ class DashboardManager(QObject):
         fresh = [copy.deepcopy(p) for p in self._projects] if self._projects else []
         return fresh
 
-    def _project_to_dict(self, p):
-        def safe_str(val):
-            try:
-                return str(val)
-            except Exception:
-                return ""
-        def safe_int(val):
-            try:
-                return int(val)
-            except Exception:
-                return 0
-        return {
-            "id": safe_int(getattr(p, "id", 0)),
-            "name": safe_str(getattr(p, "name", "")),
-            "description": safe_str(getattr(p, "description", "")),
-            "deadline": safe_str(getattr(p, "deadline", "")),
-        }
     @Slot(int, int, int, int, str, str)
     def recategorizeTaskOrSubtask(self, user_id, project_id, task_id, subtask_id, old_category, new_category):
         """
@@ -330,22 +340,13 @@ class DashboardManager(QObject):
         Logs all changes as events with timestamps.
         """
         try:
-            from Project_APP.APP.backend.db import update_subtask_category, update_task, log_structured_event
+            from Project_APP.APP.db import update_subtask_category, update_task, log_structured_event
             import datetime
             # Only one of task_id or subtask_id should be set
             if subtask_id and subtask_id > 0:
-                update_subtask_category(subtask_id, new_category)
-                log_structured_event(
-                    None,  # session will be created inside
-                    event_type="recategorization",
-                    user_id=user_id,
-                    project_id=project_id,
-                    task_id=task_id if task_id > 0 else None,
-                    subtask_id=subtask_id,
-                    old_category=old_category,
-                    new_category=new_category,
-                    reasoning="User drag-and-drop recategorization",
-                    context_json=None
+                # Logs the recategorization event (with the subtask's task and project)
+                update_subtask_category(
+                    subtask_id, new_category, user_id=user_id, reasoning="User drag-and-drop recategorization"
                 )
             elif task_id and task_id > 0:
                 update_task(task_id, category=new_category)
@@ -371,17 +372,45 @@ class DashboardManager(QObject):
         """
         Integrate TinyLlama LLM to suggest Eisenhower matrix categorization for a task/subtask.
         Uses event logs as context and logs LLM suggestions with reasoning.
+        The request runs on a worker thread so the UI stays responsive while the model answers.
         """
+        import threading
+        threading.Thread(
+            target=self._suggest_eisenhower_category,
+            args=(user_id, project_id, task_id, subtask_id),
+            daemon=True,
+        ).start()
+
+    def _suggest_eisenhower_category(self, user_id, project_id, task_id, subtask_id):
         try:
-            import requests
             import json
 
-            # Gather context: last 50 event logs for this project/user
-            logs = get_event_logs(project_id=project_id, user_id=user_id, limit=50)
-            context = [
+            from Project_APP.APP.backend.context_budget import assemble_context
+            from Project_APP.APP.backend.llm_cache import DETERMINISTIC_OPTIONS
+            from Project_APP.APP.backend.model_router import EISENHOWER, get_router
+            from Project_APP.APP.read_models import load_subtask_detail, load_task
+            # Must answer within the request timeout
+            planner = get_router().planner_for(EISENHOWER, "query_json", latency_slo=10)
+            if planner is None:
+                return
+
+            item = None
+            if subtask_id and subtask_id > 0:
+                detail = load_subtask_detail(subtask_id)
+                item = detail.subtask if detail else None
+            elif task_id and task_id > 0:
+                item = load_task(task_id)
+            if item is None:
+                return
+
+            # Gather candidate context from the project's recent history, then keep the most
+            # relevant items that fit the model's token budget
+            logs = get_event_logs(project_id=project_id, limit=EISENHOWER_CONTEXT_CANDIDATES)
+            history = [
                 {
                     "timestamp": str(getattr(e, "timestamp", "")),
                     "event_type": getattr(e, "event_type", ""),
+                    "user_id": getattr(e, "user_id", None),
                     "old_category": getattr(e, "old_category", ""),
                     "new_category": getattr(e, "new_category", ""),
                     "reasoning": getattr(e, "reasoning", ""),
@@ -390,43 +419,131 @@ class DashboardManager(QObject):
                 }
                 for e in logs
             ]
-            # Prepare payload for LLM
-            payload = {
-                "user_id": user_id,
-                "project_id": project_id,
-                "task_id": task_id,
-                "subtask_id": subtask_id,
-                "context": context
-            }
-            # Call TinyLlama container (assume HTTP API at localhost:8000/suggest)
-            response = requests.post("http://localhost:8000/suggest", json=payload, timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                suggested_category = result.get("suggested_category")
-                reasoning = result.get("reasoning", "")
-                # Apply suggestion to subtask if subtask_id is set
-                if subtask_id and subtask_id > 0 and suggested_category:
-                    update_subtask_category(subtask_id, suggested_category)
-                # Log LLM suggestion event
-                log_structured_event(
-                    None,
-                    event_type="llm_suggestion",
-                    user_id=user_id,
-                    project_id=project_id,
-                    task_id=task_id if task_id > 0 else None,
-                    subtask_id=subtask_id if subtask_id > 0 else None,
-                    old_category=None,
-                    new_category=suggested_category,
-                    reasoning=reasoning,
-                    context_json={"llm_response": result, "llm_payload": payload}
+            target = {"user_id": user_id, "task_id": task_id, "subtask_id": subtask_id}
+            context, _ = assemble_context(history, model=planner.model_name, target=target)
+            prompt = EISENHOWER_PROMPT.format(
+                context=json.dumps(context, default=str),
+                title=item.title,
+                description=item.description or "",
+            )
+            # Interactive priority; a newer request for the same item supersedes a queued one.
+            # Deterministic options so an unchanged item and history answer from the cache.
+            result = planner.query_json(
+                prompt,
+                schema=EISENHOWER_SCHEMA,
+                options=DETERMINISTIC_OPTIONS,
+                key=f"eisenhower:{user_id}:{project_id}:{task_id}:{subtask_id}",
+                wait_timeout=EISENHOWER_WAIT_TIMEOUT,
+            )
+            if result is None:
+                print("[DEBUG] LLM returned no Eisenhower suggestion")
+                return
+            suggested_category = result.get("suggested_category")
+            if suggested_category not in EISENHOWER_SCHEMA["properties"]["suggested_category"]["enum"]:
+                suggested_category = None
+            reasoning = result.get("reasoning", "")
+            # Apply suggestion to subtask if subtask_id is set
+            if subtask_id and subtask_id > 0 and suggested_category:
+                update_subtask_category(
+                    subtask_id, suggested_category, user_id=user_id, reasoning="Applied LLM suggestion"
                 )
-                # Optionally reload Eisenhower matrix state
-                self.loadEisenhowerMatrixState(user_id, project_id)
-            else:
-                print(f"[DEBUG] LLM API error: {response.status_code} {response.text}")
+            # Log LLM suggestion event
+            log_structured_event(
+                None,
+                event_type="llm_suggestion",
+                user_id=user_id,
+                project_id=project_id,
+                task_id=task_id if task_id > 0 else None,
+                subtask_id=subtask_id if subtask_id > 0 else None,
+                old_category=None,
+                new_category=suggested_category,
+                reasoning=reasoning,
+                context_json={"llm_response": result, "model": planner.model_name, "context": context}
+            )
+            # Optionally reload Eisenhower matrix state
+            self._eisenhowerSuggestionDone.emit(user_id, project_id)
         except Exception as e:
             print(f"[DEBUG] suggestEisenhowerCategory exception: {e}")
 
+class LLMStreamBridge(QObject):
+    """
+    Streams LLM output to QML token by token.
+    Generation runs on a worker thread; tokens are appended to `text` on the UI thread.
+    """
+    tokenReceived = Signal(int, str)  # generation, token
+    finished = Signal(int, str)  # generation, full response text
+    textChanged = Signal()
+    busyChanged = Signal()
+
+    MODELS = {
+        "tinyllama:1.1b": tiny_llama.TinyLlamaPlanner,
+        "deepseek-r1:8b": deepseek_r1.DeepSeekR1,
+        "deepseek-r1:32b": deepseek_r1_32b.DeepSeekR1_32B,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._text = ""
+        self._busy = False
+        self._generation = 0
+        # Signals are emitted from the worker thread and delivered queued on the UI thread
+        self.tokenReceived.connect(self._append_token)
+        self.finished.connect(self._on_finished)
+
+    @Slot(str, str)
+    def startStream(self, model_name, prompt):
+        """Start streaming a response; any stream already running is superseded."""
+        import threading
+        self._generation += 1
+        generation = self._generation
+        self._text = ""
+        self.textChanged.emit()
+        self._busy = True
+        self.busyChanged.emit()
+        planner_cls = self.MODELS.get(model_name, tiny_llama.TinyLlamaPlanner)
+        planner = planner_cls(model_name) if model_name in self.MODELS else planner_cls()
+
+        def worker():
+            parts = []
+            for token in planner.stream_llm(prompt):
+                if generation != self._generation:
+                    return  # cancelled or superseded
+                parts.append(token)
+                self.tokenReceived.emit(generation, token)
+            self.finished.emit(generation, "".join(parts))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    @Slot()
+    def cancel(self):
+        """Stop forwarding tokens from the current stream."""
+        self._generation += 1
+        if self._busy:
+            self._busy = False
+            self.busyChanged.emit()
+
+    def _append_token(self, generation, token):
+        # The worker's check can pass just before a new stream starts, so tokens still queued
+        # for an old generation are dropped here, on the UI thread that owns the counter
+        if generation != self._generation:
+            return
+        self._text += token
+        self.textChanged.emit()
+
+    def _on_finished(self, generation, _full_text):
+        if generation != self._generation:
+            return
+        self._busy = False
+        self.busyChanged.emit()
+
+    @Property(str, notify=textChanged)
+    def text(self):
+        return self._text
+
+    @Property(bool, notify=busyChanged)
+    def busy(self):
+        return self._busy
+
 #
 # # get_user_projects, get_user_tasks, get_user_messages are now imported above
 # 
@@ -654,22 +771,16 @@ class ProjectManager(QObject):
     def loadProjectMembers(self, project_id):
         """Load members for a project and emit membersChanged."""
         try:
-            from Project_APP.APP.backend.db import get_project_members
-            self._members = get_project_members(project_id)
+            from Project_APP.APP.read_models import load_project_members
+            self._members = load_project_members(project_id)
             self.membersChanged.emit()
         except Exception as e:
             pass
 
     @Property(list, notify=membersChanged)
     def members(self):
-        return [
-            {
-                "user_id": getattr(m, "user_id", None),
-                "username": getattr(getattr(m, "user", None), "username", ""),
-                "role": getattr(m, "role", ""),
-            }
-            for m in self._members
-        ] if self._members else []
+        from Project_APP.APP.read_models import as_dict
+        return [as_dict(m) for m in self._members]
 
     @Slot(int, int, int, str)
     def addProjectMember(self, project_id, acting_user_id, new_member_id, role):
@@ -722,18 +833,18 @@ class ProjectManager(QObject):
 
     @Slot(int)
     def loadTaskDetail(self, task_id):
-        from Project_APP.APP.backend.db import get_task_by_id
-        task = get_task_by_id(task_id)
+        from Project_APP.APP.read_models import load_task
+        task = load_task(task_id)
         if task:
             detail = {
                 "id": task.id,
                 "title": task.title,
                 "status": task.status,
-                "due_date": str(task.due_date) if getattr(task, "due_date", None) not in (None, "") else "",
+                "due_date": str(task.due_date) if task.due_date else "",
                 "description": task.description,
-                "assigned_to": getattr(task, "assigned_to", ""),
-                "category": getattr(task, "category", "other"),
-                "project_id": getattr(task, "project_id", None),
+                "assigned_to": task.assigned_to if task.assigned_to is not None else "",
+                "category": "other",  # tasks have no category column; subtasks do
+                "project_id": task.project_id,
             }
             self.taskDetailLoaded.emit(detail)
         else:
@@ -754,28 +865,27 @@ class ProjectManager(QObject):
         Loads all tasks and subtasks for the project, including dependencies, durations, and assigned_to.
         If filter_user_id >= 0, only include tasks/subtasks assigned to that user.
         """
-        from Project_APP.APP.backend.db import get_project_by_id, get_subtasks
-        import json
-        project = get_project_by_id(project_id)
-        if project:
+        from Project_APP.APP.backend.db import get_project_dependency_edges
+        from Project_APP.APP.read_models import load_project_schedule
+        schedule = load_project_schedule(project_id)
+        if schedule.tasks:
             items = []
+            # One indexed query for the whole project's dependency graph
+            edges = get_project_dependency_edges(project_id)
+            subtasks = {}
+            for st in schedule.subtasks:
+                subtasks.setdefault(st.task_id, []).append(st)
             # Tasks
-            for t in getattr(project, "tasks", []):
-                if filter_user_id >= 0 and getattr(t, "assigned_to", None) != filter_user_id:
+            for t in schedule.tasks:
+                if filter_user_id >= 0 and t.assigned_to != filter_user_id:
                     continue
                 end = t.due_date
-                duration = t.hours if hasattr(t, "hours") and t.hours else 1
+                duration = t.hours or 1
                 start = None
                 if end and duration:
                     from datetime import timedelta
                     start = end - timedelta(hours=duration)
-                # Parse dependencies
-                deps = []
-                if getattr(t, "dependencies", None):
-                    try:
-                        deps = json.loads(t.dependencies)
-                    except Exception:
-                        deps = []
+                deps = [dep_id for _, dep_id in edges.get(("task", t.id), [])]
                 items.append({
                     "type": "task",
                     "id": t.id,
@@ -783,25 +893,20 @@ class ProjectManager(QObject):
                     "start": str(start) if start else "",
                     "end": str(end) if end else "",
                     "duration": duration,
-                    "assigned_to": getattr(t, "assigned_to", None),
+                    "assigned_to": t.assigned_to,
                     "dependencies": deps,
                 })
                 # Subtasks
-                for st in getattr(t, "subtasks", []):
-                    if filter_user_id >= 0 and getattr(st, "assigned_to", None) != filter_user_id:
+                for st in subtasks.get(t.id, ()):
+                    if filter_user_id >= 0 and st.assigned_to != filter_user_id:
                         continue
                     st_end = st.due_date
-                    st_duration = st.hours if hasattr(st, "hours") and st.hours else 1
+                    st_duration = st.hours or 1
                     st_start = None
                     if st_end and st_duration:
                         from datetime import timedelta
                         st_start = st_end - timedelta(hours=st_duration)
-                    st_deps = []
-                    if getattr(st, "dependencies", None):
-                        try:
-                            st_deps = json.loads(st.dependencies)
-                        except Exception:
-                            st_deps = []
+                    st_deps = [dep_id for _, dep_id in edges.get(("subtask", st.id), [])]
                     items.append({
                         "type": "subtask",
                         "id": st.id,
@@ -809,7 +914,7 @@ class ProjectManager(QObject):
                         "start": str(st_start) if st_start else "",
                         "end": str(st_end) if st_end else "",
                         "duration": st_duration,
-                        "assigned_to": getattr(st, "assigned_to", None),
+                        "assigned_to": st.assigned_to,
                         "dependencies": st_deps,
                         "parent_task_id": st.task_id,
                     })
@@ -823,9 +928,8 @@ class ProjectManager(QObject):
         Loads all deadlines, tasks, subtasks, public holidays, and personal time off for all team members.
         If filter_user_id >= 0, only include items for that user.
         """
-        from Project_APP.APP.backend.db import get_project_by_id
-        import json
-        project = get_project_by_id(project_id)
+        from Project_APP.APP.read_models import load_project_schedule
+        schedule = load_project_schedule(project_id)
         # Demo: static public holidays and time off
         public_holidays = [
             {"type": "holiday", "title": "New Year's Day", "date": "2025-01-01"},
@@ -836,29 +940,32 @@ class ProjectManager(QObject):
             {"type": "pto", "user_id": 2, "title": "Alice PTO", "date": "2025-08-28"},
             {"type": "pto", "user_id": 3, "title": "Bob PTO", "date": "2025-09-02"},
         ]
-        if project:
+        if schedule.tasks:
             events = []
+            subtasks = {}
+            for st in schedule.subtasks:
+                subtasks.setdefault(st.task_id, []).append(st)
             # Tasks
-            for t in getattr(project, "tasks", []):
-                if filter_user_id >= 0 and getattr(t, "assigned_to", None) != filter_user_id:
+            for t in schedule.tasks:
+                if filter_user_id >= 0 and t.assigned_to != filter_user_id:
                     continue
                 events.append({
                     "type": "task",
                     "id": t.id,
                     "title": t.title,
                     "due_date": str(t.due_date) if t.due_date else "",
-                    "assigned_to": getattr(t, "assigned_to", None),
+                    "assigned_to": t.assigned_to,
                 })
                 # Subtasks
-                for st in getattr(t, "subtasks", []):
-                    if filter_user_id >= 0 and getattr(st, "assigned_to", None) != filter_user_id:
+                for st in subtasks.get(t.id, ()):
+                    if filter_user_id >= 0 and st.assigned_to != filter_user_id:
                         continue
                     events.append({
                         "type": "subtask",
                         "id": st.id,
                         "title": st.title,
                         "due_date": str(st.due_date) if st.due_date else "",
-                        "assigned_to": getattr(st, "assigned_to", None),
+                        "assigned_to": st.assigned_to,
                         "parent_task_id": st.task_id,
                     })
             # Add public holidays and PTO (filter PTO by user if needed)
@@ -876,13 +983,13 @@ class ProjectManager(QObject):
         from __main__ import global_loading_manager
         global_loading_manager.loading = True
         global_loading_manager.progress = 0.1
-        from db import get_project_by_id
-        project = get_project_by_id(project_id, user_id)
+        from Project_APP.APP.read_models import load_project_detail
+        project = load_project_detail(project_id, user_id)
         global_loading_manager.progress = 0.5
         if project:
             # Convert project and its tasks to dict for QML
             tasks = []
-            for t in getattr(project, "tasks", []):
+            for t in project.tasks:
                 tasks.append({
                     "id": t.id,
                     "title": t.title,
@@ -896,7 +1003,7 @@ class ProjectManager(QObject):
                 "name": project.name,
                 "description": project.description,
                 "deadline": project.deadline,
-                "owner": getattr(project.owner, "username", ""),
+                "owner": project.owner_username,
                 "tasks": tasks,
             }
             self.projectDetailLoaded.emit(detail)
@@ -907,16 +1014,17 @@ class ProjectManager(QObject):
 
     @Slot(int)
     def loadSubtaskDetail(self, subtask_id):
-        from Project_APP.APP.backend.db import get_subtask_by_id
-        subtask = get_subtask_by_id(subtask_id)
-        if subtask:
+        from Project_APP.APP.read_models import load_subtask_detail
+        loaded = load_subtask_detail(subtask_id)
+        if loaded:
+            subtask = loaded.subtask
             detail = {
                 "id": subtask.id,
                 "title": subtask.title,
                 "description": subtask.description,
                 "status": subtask.status,
-                "due_date": str(subtask.due_date) if getattr(subtask, "due_date", None) not in (None, "") else "",
-                "assigned_to": getattr(subtask.assignee, "username", ""),
+                "due_date": str(subtask.due_date) if subtask.due_date else "",
+                "assigned_to": loaded.assignee_username,
                 "category": subtask.category,
             }
             self.subtaskDetailLoaded.emit(detail)
@@ -1041,11 +1149,24 @@ class ProjectManager(QObject):
 import os
 import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from git import Repo, InvalidGitRepositoryError, NoSuchPathError
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+COMMIT_SUMMARY_MAX_DIFF_CHARS = 8000  # keeps large saves inside the model's context window
+COMMIT_SUMMARY_PROMPT = (
+    "You are a git commit summarizer. Read the following diff and provide ONLY a concise commit message. "
+    "DO NOT provide explanations or reasoning. "
+    "Provide your commit message in JSON format: {{\"commit_msg\": \"...\"}}\n"
+    "DIFF: {diff}"
+)
+COMMIT_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {"commit_msg": {"type": "string"}},
+    "required": ["commit_msg"],
+}
+
 # (removed broken import)
 
 PROJECT_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../project_files"))
@@ -1089,6 +1210,8 @@ class ProjectFileChangeHandler(FileSystemEventHandler):
     def __init__(self, manager):
         super().__init__()
         self.manager = manager
+        # git add/commit run here, one at a time, so they never hold an LLM slot
+        self._commits = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vcs-commit")
 
     def on_modified(self, event):
         self._handle_event(event)
@@ -1102,15 +1225,45 @@ class ProjectFileChangeHandler(FileSystemEventHandler):
         file_path = event.src_path
         project_dir = self._find_project_dir(file_path)
         if project_dir:
+            # Summarise as background LLM work, then commit; a newer save of the same
+            # file supersedes a summary that is still queued.
+            from Project_APP.APP.backend.llm_scheduler import BACKGROUND, QueueFullError, get_scheduler
+            from Project_APP.APP.backend.model_router import COMMIT_SUMMARY, get_router
+            model = get_router().choose(COMMIT_SUMMARY)
             try:
-                repo = Repo(project_dir)
-                rel_path = os.path.relpath(file_path, project_dir)
-                repo.index.add([rel_path])
-                # Generate commit summary using LLM
-                summary = self._get_llm_commit_summary(file_path)
-                repo.index.commit(summary or "Auto-commit: file changed")
-            except Exception as e:
-                print(f"[VCS] Error handling file change: {e}")
+                summary = get_scheduler().submit(
+                    model,
+                    self._get_llm_commit_summary,
+                    file_path,
+                    model,
+                    priority=BACKGROUND,
+                    key=f"commit_summary:{file_path}",
+                    task=COMMIT_SUMMARY,
+                )
+            except QueueFullError:
+                # Under backpressure skip the summary rather than drop the commit
+                self._commits.submit(self._commit_file, project_dir, file_path)
+                return
+            summary.add_done_callback(lambda future: self._summary_done(project_dir, file_path, future))
+
+    def _summary_done(self, project_dir, file_path, future):
+        if future.cancelled():
+            return  # superseded: the newer save commits the file
+        try:
+            summary = future.result()
+        except Exception as e:
+            print(f"[LLM] Commit summary error: {e}")
+            summary = None
+        self._commits.submit(self._commit_file, project_dir, file_path, summary)
+
+    def _commit_file(self, project_dir, file_path, summary=None):
+        try:
+            repo = Repo(project_dir)
+            rel_path = os.path.relpath(file_path, project_dir)
+            repo.index.add([rel_path])
+            repo.index.commit(summary or "Auto-commit: file changed")
+        except Exception as e:
+            print(f"[VCS] Error handling file change: {e}")
 
     def _find_project_dir(self, file_path):
         # Find the nearest parent directory that matches a project directory
@@ -1125,17 +1278,81 @@ class ProjectFileChangeHandler(FileSystemEventHandler):
                 return project_dir
         return None
 
-    def _get_llm_commit_summary(self, file_path):
-        # Placeholder: call LLM endpoint for commit summary
+    def _get_llm_commit_summary(self, file_path, model=None):
+        # Runs inside the scheduled job, so call the client directly rather than through a
+        # planner (a nested scheduler run would wait on the slot this job holds)
         try:
-            resp = requests.post("http://localhost:8000/llm/commit_summary", json={"file_path": file_path}, timeout=5)
-            if resp.status_code == 200:
-                return resp.json().get("summary", "")
+            from Project_APP.APP.backend.llm_cache import DETERMINISTIC_OPTIONS
+            from Project_APP.APP.backend.model_manager import keep_alive_for
+            from Project_APP.APP.backend.ollama_client import get_client
+            from Project_APP.APP.backend.structured_output import generate_structured
+            model = model or "tinyllama:1.1b"
+            diff = self._file_diff(file_path)
+            if not diff:
+                return None
+            # Deterministic options: saving the same change twice reuses the cached summary
+            result = generate_structured(
+                get_client(),
+                model,
+                COMMIT_SUMMARY_PROMPT.format(diff=diff[:COMMIT_SUMMARY_MAX_DIFF_CHARS]),
+                schema=COMMIT_SUMMARY_SCHEMA,
+                options=DETERMINISTIC_OPTIONS,
+                keep_alive=keep_alive_for(model),
+            )
+            if result:
+                return result.get("commit_msg", "").strip() or None
         except Exception as e:
             print(f"[LLM] Commit summary error: {e}")
         return None
 
+    def _file_diff(self, file_path):
+        """Diff of the file against HEAD, or its contents if it is new to the repo."""
+        project_dir = self._find_project_dir(file_path)
+        try:
+            repo = Repo(project_dir)
+            rel_path = os.path.relpath(file_path, project_dir)
+            if repo.head.is_valid():
+                diff = repo.git.diff("HEAD", "--", rel_path)
+                if diff:
+                    return diff
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read(COMMIT_SUMMARY_MAX_DIFF_CHARS)
+        except Exception as e:
+            print(f"[VCS] Error reading diff: {e}")
+            return None
+
+class SearchManager(QObject):
+    """Full-text search for the sidebar search box."""
+    resultsChanged = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._results = []
+
+    @Slot(int, str)
+    def search(self, user_id, query):
+        from Project_APP.APP.db import search
+        results, _ = search(user_id, query, limit=20) if query.strip() else ([], None)
+        self._results = results
+        self.resultsChanged.emit()
+
+    @Slot()
+    def clear(self):
+        self._results = []
+        self.resultsChanged.emit()
+
+    @Property(list, notify=resultsChanged)
+    def results(self):
+        return self._results
+
 if __name__ == "__main__":
+    # Apply pending schema migrations (one version query when the database is current)
+    from Project_APP.APP.db import init_db
+    init_db()
+    # Move aged event_logs rows to monthly archives in the background
+    from Project_APP.APP.event_retention import start_retention_worker
+    start_retention_worker()
+
     # Start project file manager (creates dirs, sets up git, starts watcher)
     pfm = ProjectFileManager()
 
@@ -1162,21 +1379,59 @@ if __name__ == "__main__":
     # Expose UserManager to QML
     user_manager = UserManager()
     engine.rootContext().setContextProperty("userManager", user_manager)
+    # Expose LLM token streaming to QML
+    llm_stream = LLMStreamBridge()
+    engine.rootContext().setContextProperty("llmStream", llm_stream)
+    # Expose full-text search to QML
+    search_manager = SearchManager()
+    engine.rootContext().setContextProperty("searchManager", search_manager)
 
     # Expose LoginManager to QML
     login_manager = LoginManager()
 
+from Project_APP.APP.backend.model_manager import SETTLED as SETTLED_MODEL_STATES
+
 # Keep a global reference to LoadingManager to prevent garbage collection
 global_loading_manager = None
 
 class LoadingManager(QObject):
     loadingChanged = Signal()
     progressChanged = Signal()
+    modelStatusChanged = Signal()
+    _modelStateReceived = Signal(str, str)  # marshals lifecycle events onto the UI thread
 
     def __init__(self):
         super().__init__()
         self._loading = False
         self._progress = 0.0
+        self._model_states = {}
+        self._preloaded = False  # latched once the initial preload pass has settled
+        self._modelStateReceived.connect(self._on_model_state)
+
+    def watchModels(self, model_manager):
+        """Mirror a ModelLifecycleManager's readiness in modelStatus / modelsReady."""
+        self._model_states = model_manager.states()
+        self._preloaded = False
+        model_manager.add_listener(self._modelStateReceived.emit)
+        self.modelStatusChanged.emit()
+
+    def _on_model_state(self, model, state):
+        self._model_states[model] = state
+        self.modelStatusChanged.emit()
+
+    @Property(str, notify=modelStatusChanged)
+    def modelStatus(self):
+        return ", ".join(f"{model}: {state}" for model, state in self._model_states.items())
+
+    @Property(bool, notify=modelStatusChanged)
+    def modelsReady(self):
+        """
+        True once preloading has settled for every model (a failed or skipped model is not waited for).
+        Stays True afterwards: later unloads and on-demand reloads do not bring the banner back.
+        """
+        if not self._preloaded:
+            self._preloaded = all(state in SETTLED_MODEL_STATES for state in self._model_states.values())
+        return self._preloaded
 
     @Property(bool, notify=loadingChanged)
     def loading(self):
@@ -1199,6 +1454,11 @@ class LoadingManager(QObject):
             self.progressChanged.emit()
 
 global_loading_manager = LoadingManager()
+# Warm up LLMs in the background so the first request does not pay the model-load cost
+from Project_APP.APP.backend.model_manager import get_model_manager
+model_manager = get_model_manager()
+global_loading_manager.watchModels(model_manager)
+model_manager.start()
 engine.rootContext().setContextProperty("loadingManager", global_loading_manager)
 engine.rootContext().setContextProperty("loginManager", login_manager)
 
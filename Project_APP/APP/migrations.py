@@ -0,0 +1,242 @@
+# migrations.py: versioned schema migrations for the application database.
+#
+# Migrations run once each, in version order, and are recorded in schema_version together with a
+# checksum of their source. When the database is current, init_db costs one query
+# (SELECT MAX(version)). Every migration must be safe to re-run: a process that dies after a
+# migration but before recording it runs it again on the next start. DDL therefore uses
+# checkfirst / IF NOT EXISTS. A migration that raises is not recorded and runs again next start,
+# so migration bodies must let errors propagate instead of logging and carrying on.
+#
+#   python -m Project_APP.APP.migrations            # apply pending migrations
+#   python -m Project_APP.APP.migrations --status   # list applied/pending, verify checksums
+#
+# Migrations go through SQLAlchemy metadata and generic DDL, so they run on SQLite and on a
+# DATABASE_URL backend alike; SQLite-only features (the FTS5 search index) are skipped elsewhere.
+#
+# Each migration takes the engine it migrates. Per-tenant databases (db.TENANT_DB_DIR) carry their
+# own schema_version and are migrated by db.tenant_engine() when first opened; there the catalog
+# tables (users, roles, ...) are left to the main database.
+
+import hashlib
+import inspect
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from Project_APP.APP import db
+from Project_APP.APP import migrations_baseline
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version", metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("checksum", String, nullable=False),
+    Column("applied_at", DateTime, server_default=func.current_timestamp()),
+    Column("duration_ms", Integer),
+)
+
+
+# --------------------------
+# Migrations
+# --------------------------
+def _is_tenant(engine):
+    return engine is not db.engine
+
+
+def m0001_baseline_schema(engine):
+    """Create missing baseline tables/indexes and add baseline columns that older databases lack."""
+    tables = [
+        table for table in migrations_baseline.metadata.sorted_tables
+        if not (_is_tenant(engine) and table.name in db.CATALOG_TABLES)
+    ]
+    with engine.begin() as conn:
+        migrations_baseline.metadata.create_all(conn, tables=tables)
+        existing_tables = set(sa_inspect(conn).get_table_names())
+        for table in tables:
+            if table.name not in existing_tables:
+                continue
+            present = {c["name"] for c in sa_inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                if column.primary_key or (not column.nullable and column.server_default is None):
+                    db.log_error(f"Cannot add required column {table.name}.{column.name} to an existing table")
+                    continue
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                db.log_event(f"Added column {table.name}.{column.name}")
+
+
+def m0002_dependency_edges(engine):
+    """Copy legacy JSON dependencies into task_dependencies."""
+    with Session(engine) as session:
+        db._migrate_json_dependencies(session)
+        session.commit()
+
+
+def m0003_project_stats(engine):
+    """Build the project_stats counters for existing projects."""
+    with engine.begin() as conn:
+        db._rebuild_project_stats(conn)
+
+
+def m0004_seed_roles_and_admin(engine):
+    """Default roles, permissions and the admin user (catalog data: main database only)."""
+    if not _is_tenant(engine):
+        db.seed_admin_and_roles()
+
+
+def m0005_search_index(engine):
+    """FTS5 search index with sync triggers (skipped where FTS5 is unavailable)."""
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        db.create_search_index(engine)
+    except Exception as e:
+        db.log_error(f"Full-text search unavailable (SQLite built without FTS5?): {e}")
+
+
+def m0006_event_retention(engine):
+    """event_log_rollups and the (event_type, timestamp) index the retention job reads."""
+    with engine.begin() as conn:
+        db.EventLogRollup.__table__.create(conn, checkfirst=True)
+        for index in db.EventLog.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# (version, name, function) in the order they must run; never renumber or edit an applied one
+MIGRATIONS = [
+    (1, "baseline_schema", m0001_baseline_schema),
+    (2, "dependency_edges", m0002_dependency_edges),
+    (3, "project_stats", m0003_project_stats),
+    (4, "seed_roles_and_admin", m0004_seed_roles_and_admin),
+    (5, "search_index", m0005_search_index),
+    (6, "event_retention", m0006_event_retention),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# --------------------------
+# Runner
+# --------------------------
+def checksum(fn):
+    source = inspect.getsource(fn)
+    if fn is m0001_baseline_schema:
+        source += inspect.getsource(migrations_baseline)  # the frozen schema is part of version 1
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def current_version(engine=None):
+    """Highest applied version (0 for a database that has never been migrated)."""
+    engine = engine or db.engine
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except Exception:
+        return 0  # no schema_version table yet
+
+
+def applied_migrations(engine=None):
+    engine = engine or db.engine
+    metadata.create_all(engine)
+    with engine.connect() as conn:
+        return {row.version: row for row in conn.execute(select(schema_version))}
+
+
+def verify_checksums(applied):
+    """Names of applied migrations whose source changed after they ran."""
+    changed = []
+    for version, name, fn in MIGRATIONS:
+        row = applied.get(version)
+        if row is not None and row.checksum != checksum(fn):
+            changed.append(f"{version:04d}_{name}")
+    return changed
+
+
+MIGRATION_LOCK_KEY = 0x6D696772  # pg_advisory_lock key shared by every app process
+
+
+@contextmanager
+def _migration_lock(engine):
+    """On PostgreSQL, let one process at a time migrate; the others wait, then find it current.
+    SQLite needs no lock: its writer lock plus idempotent migrations cover concurrent starts."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def migrate(engine=None):
+    """Apply pending migrations; returns the versions applied (empty when already current)."""
+    engine = engine or db.engine
+    if current_version(engine) >= LATEST_VERSION:
+        return []
+    with _migration_lock(engine):
+        applied = applied_migrations(engine)
+        for name in verify_checksums(applied):
+            db.log_error(f"Migration {name} changed after it was applied")
+        ran = []
+        for version, name, fn in MIGRATIONS:
+            if version in applied:
+                continue
+            started = time.perf_counter()
+            try:
+                fn(engine)
+            except Exception as e:
+                db.log_error(f"Migration {version:04d}_{name} failed (not recorded, retried next start): {e}")
+                raise
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(schema_version).values(
+                        version=version, name=name, checksum=checksum(fn), duration_ms=duration_ms
+                    ))
+            except IntegrityError:
+                pass  # another process recorded it first; the migration is idempotent
+            db.log_event(f"Applied migration {version:04d}_{name} in {duration_ms} ms")
+            ran.append(version)
+    return ran
+
+
+def status():
+    applied = applied_migrations()
+    changed = set(verify_checksums(applied))
+    for version, name, fn in MIGRATIONS:
+        label = f"{version:04d}_{name}"
+        row = applied.get(version)
+        if row is None:
+            print(f"[PENDING] {label}")
+        else:
+            flag = " (CHECKSUM CHANGED)" if label in changed else ""
+            print(f"[APPLIED] {label} at {row.applied_at} in {row.duration_ms} ms{flag}")
+    return 1 if changed else 0
+
+
+def migrate_tenants():
+    """Open, and so migrate, every existing tenant database; returns how many there are."""
+    tenant_ids = db.tenant_ids()[1:]
+    for tenant_id in tenant_ids:
+        db.tenant_engine(tenant_id)
+    return len(tenant_ids)
+
+
+if __name__ == "__main__":
+    if "--status" in sys.argv:
+        sys.exit(status())
+    versions = migrate()
+    print(f"Applied {len(versions)} migration(s); schema is at version {current_version()}.")
+    tenants = migrate_tenants()
+    if tenants:
+        print(f"Tenant databases at version {LATEST_VERSION}: {tenants}")
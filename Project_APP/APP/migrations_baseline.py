@@ -0,0 +1,233 @@
+# migrations_baseline.py: the schema of migration 0001, frozen.
+#
+# m0001_baseline_schema builds these definitions, not the live models in db.py, so what version 1
+# creates never changes after it has been applied somewhere. Model changes get their own
+# migration in migrations.py; never edit this file.
+
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text, UniqueConstraint, func
+
+metadata = MetaData()
+
+Table(
+    "permissions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("description", Text),
+    UniqueConstraint("name"),
+)
+
+Table(
+    "roles", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("description", Text),
+    UniqueConstraint("name"),
+)
+
+Table(
+    "tenants", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    UniqueConstraint("name"),
+)
+
+Table(
+    "role_permissions", metadata,
+    Column("role_id", Integer, ForeignKey("roles.id"), primary_key=True),
+    Column("permission_id", Integer, ForeignKey("permissions.id"), primary_key=True),
+)
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("is_active", Boolean),
+    Column("tenant_id", Integer, ForeignKey("tenants.id")),
+    Column("sso_provider", String),
+    UniqueConstraint("username"),
+)
+
+Table(
+    "events", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("start_datetime", DateTime, nullable=False),
+    Column("end_datetime", DateTime, nullable=False),
+    Column("creator_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+)
+
+Table(
+    "messages", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("sender_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("recipient_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("timestamp", DateTime, server_default=func.current_timestamp()),
+    Column("read", Boolean),
+    Index("ix_messages_recipient_timestamp", "recipient_id", "timestamp"),
+)
+
+Table(
+    "projects", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("description", Text),
+    Column("deadline", String),
+    Column("tasks_json", Text),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("owner_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("tenant_id", Integer, ForeignKey("tenants.id")),
+)
+
+Table(
+    "refresh_tokens", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("token", String, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("is_blacklisted", Boolean),
+    UniqueConstraint("token"),
+    Index("ix_refresh_tokens_expires_at", "expires_at"),
+)
+
+Table(
+    "user_roles", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("role_id", Integer, ForeignKey("roles.id"), primary_key=True),
+)
+
+Table(
+    "eisenhower_matrix_states", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("state_json", Text, nullable=False),
+    Column("updated_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_eisenhower_matrix_states_project_user", "project_id", "user_id"),
+)
+
+Table(
+    "event_invitees", metadata,
+    Column("event_id", Integer, ForeignKey("events.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("status", String),
+)
+
+Table(
+    "github_repos", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("repo_url", String, nullable=False),
+    Column("access_token", String),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+)
+
+Table(
+    "project_members", metadata,
+    Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("role", String),
+    Column("joined_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_project_members_user_id", "user_id"),
+)
+
+Table(
+    "project_stats", metadata,
+    Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
+    Column("metric", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("value", Float, nullable=False),
+)
+
+Table(
+    "task_dependencies", metadata,
+    Column("node_type", String, primary_key=True),
+    Column("node_id", Integer, primary_key=True),
+    Column("depends_on_type", String, primary_key=True),
+    Column("depends_on_id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_task_dependencies_project", "project_id"),
+    Index("ix_task_dependencies_reverse", "depends_on_type", "depends_on_id"),
+)
+
+Table(
+    "tasks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("status", String),
+    Column("assigned_to", Integer, ForeignKey("users.id")),
+    Column("due_date", DateTime),
+    Column("hours", Float),
+    Column("dependencies", String),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_tasks_assigned_to", "assigned_to"),
+    Index("ix_tasks_project_id", "project_id"),
+)
+
+Table(
+    "subtasks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_id", Integer, ForeignKey("tasks.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("status", String),
+    Column("assigned_to", Integer, ForeignKey("users.id")),
+    Column("due_date", DateTime),
+    Column("hours", Float),
+    Column("dependencies", String),
+    Column("category", String),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_subtasks_assigned_to", "assigned_to"),
+    Index("ix_subtasks_task_id", "task_id"),
+)
+
+Table(
+    "event_logs", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("timestamp", DateTime, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("project_id", Integer, ForeignKey("projects.id")),
+    Column("task_id", Integer, ForeignKey("tasks.id")),
+    Column("subtask_id", Integer, ForeignKey("subtasks.id")),
+    Column("event_type", String, nullable=False),
+    Column("old_category", String),
+    Column("new_category", String),
+    Column("reasoning", Text),
+    Column("context_json", Text),
+    Index("ix_event_logs_project_user_timestamp", "project_id", "user_id", "timestamp"),
+    Index("ix_event_logs_user_timestamp", "user_id", "timestamp"),
+)
+
+Table(
+    "files", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("task_id", Integer, ForeignKey("tasks.id")),
+    Column("subtask_id", Integer, ForeignKey("subtasks.id")),
+    Column("filename", String, nullable=False),
+    Column("filepath", String, nullable=False),
+    Column("uploaded_by", Integer, ForeignKey("users.id"), nullable=False),
+    Column("uploaded_at", DateTime, server_default=func.current_timestamp()),
+    Column("description", Text),
+    Index("ix_files_project_id", "project_id"),
+)
+
+Table(
+    "file_versions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("file_id", Integer, ForeignKey("files.id"), nullable=False),
+    Column("repo_id", Integer, ForeignKey("github_repos.id"), nullable=False),
+    Column("commit_hash", String, nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("committed_at", DateTime, server_default=func.current_timestamp()),
+    Column("author", String),
+)
@@ -0,0 +1,202 @@
+# read_models.py: immutable read records for the UI and API.
+#
+# Each loader selects only the columns one screen needs and wraps every row in a NamedTuple
+# record. Records are plain tuples with __slots__ = () and no session, identity map or lazy
+# relationships, so reading a field never queries the database or raises
+# DetachedInstanceError. They are safe to cache and to pass between threads. as_dict() turns a
+# record into a dict for QML or JSON with a plain field copy.
+#
+# Usernames come from a separate catalog query rather than a join. Users stay in the main
+# database when tenant data lives in per-tenant databases (see db.TENANT_DB_DIR).
+
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from Project_APP.APP import db
+from Project_APP.APP.db import Project, ProjectMember, Subtask, Task, User
+
+
+# --------------------------
+# Records
+# --------------------------
+class ProjectSummary(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    deadline: Optional[str]
+
+
+class TaskRow(NamedTuple):
+    id: int
+    project_id: int
+    title: str
+    description: Optional[str]
+    status: Optional[str]
+    assigned_to: Optional[int]
+    due_date: Optional[datetime]
+    hours: Optional[float]
+
+
+class SubtaskRow(NamedTuple):
+    id: int
+    task_id: int
+    title: str
+    description: Optional[str]
+    status: Optional[str]
+    assigned_to: Optional[int]
+    due_date: Optional[datetime]
+    hours: Optional[float]
+    category: Optional[str]
+
+
+class SubtaskDetail(NamedTuple):
+    subtask: SubtaskRow
+    assignee_username: str
+
+
+class MemberRow(NamedTuple):
+    user_id: int
+    username: str
+    role: Optional[str]
+
+
+class ProjectDetail(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    deadline: Optional[str]
+    owner_id: int
+    owner_username: str
+    tasks: Tuple[TaskRow, ...]
+
+
+class ProjectSchedule(NamedTuple):
+    """Everything the Gantt and calendar views draw for one project."""
+    tasks: Tuple[TaskRow, ...]
+    subtasks: Tuple[SubtaskRow, ...]
+
+
+def _columns(model, record):
+    """Model columns in the record's field order, so rows map onto records positionally."""
+    return tuple(getattr(model, field) for field in record._fields)
+
+
+_PROJECT_SUMMARY_COLUMNS = _columns(Project, ProjectSummary)
+_TASK_COLUMNS = _columns(Task, TaskRow)
+_SUBTASK_COLUMNS = _columns(Subtask, SubtaskRow)
+
+
+def _plain(value):
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return as_dict(value)
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    if isinstance(value, (datetime, date)):
+        return str(value)
+    return value
+
+
+def as_dict(record):
+    """Field copy of a record for QML/JSON (dates as strings, nested records as dicts)."""
+    return {field: _plain(value) for field, value in zip(record._fields, record)}
+
+
+# --------------------------
+# Loaders
+# --------------------------
+def _usernames(session, user_ids) -> Dict[int, str]:
+    ids = {uid for uid in user_ids if uid is not None}
+    if not ids:
+        return {}
+    return dict(session.execute(select(User.id, User.username).where(User.id.in_(ids))).all())
+
+
+def list_project_summaries(user_id: int, page_size: int = 200) -> List[ProjectSummary]:
+    """Every project the user belongs to, ordered by name (pages through list_user_projects)."""
+    projects, cursor = [], None
+    while True:
+        page, cursor, _ = db.list_user_projects(user_id, limit=page_size, after=cursor)
+        projects.extend(ProjectSummary._make(row) for row in page)
+        if cursor is None:
+            return projects
+
+
+def load_project_detail(project_id: int, user_id: Optional[int] = None) -> Optional[ProjectDetail]:
+    """Project header plus its tasks; None if missing or the user is not a member."""
+    try:
+        if user_id and user_id not in db.get_project_roles(project_id):
+            return None
+        with db.SessionLocal() as session:
+            row = session.execute(
+                select(*_PROJECT_SUMMARY_COLUMNS, Project.owner_id).where(Project.id == project_id)
+            ).first()
+            if row is None:
+                return None
+            tasks = tuple(TaskRow._make(r) for r in session.execute(
+                select(*_TASK_COLUMNS).where(Task.project_id == project_id).order_by(Task.id)
+            ))
+            owner = _usernames(session, [row.owner_id]).get(row.owner_id, "")
+        return ProjectDetail(*row, owner, tasks)
+    except Exception as e:
+        db.log_error(f"Error loading project detail: {e}")
+        return None
+
+
+def load_project_schedule(project_id: int) -> ProjectSchedule:
+    """Tasks and subtasks of a project in two column queries (no per-task subtask loads)."""
+    try:
+        with db.SessionLocal() as session:
+            tasks = tuple(TaskRow._make(r) for r in session.execute(
+                select(*_TASK_COLUMNS).where(Task.project_id == project_id).order_by(Task.id)
+            ))
+            subtasks = tuple(SubtaskRow._make(r) for r in session.execute(
+                select(*_SUBTASK_COLUMNS).join(Task, Subtask.task_id == Task.id)
+                .where(Task.project_id == project_id).order_by(Subtask.task_id, Subtask.id)
+            ))
+        return ProjectSchedule(tasks, subtasks)
+    except Exception as e:
+        db.log_error(f"Error loading project schedule: {e}")
+        return ProjectSchedule((), ())
+
+
+def load_task(task_id: int) -> Optional[TaskRow]:
+    try:
+        with db.SessionLocal() as session:
+            row = session.execute(select(*_TASK_COLUMNS).where(Task.id == task_id)).first()
+        return TaskRow._make(row) if row else None
+    except Exception as e:
+        db.log_error(f"Error loading task: {e}")
+        return None
+
+
+def load_subtask_detail(subtask_id: int) -> Optional[SubtaskDetail]:
+    try:
+        with db.SessionLocal() as session:
+            row = session.execute(select(*_SUBTASK_COLUMNS).where(Subtask.id == subtask_id)).first()
+            if row is None:
+                return None
+            subtask = SubtaskRow._make(row)
+            username = _usernames(session, [subtask.assigned_to]).get(subtask.assigned_to, "")
+        return SubtaskDetail(subtask, username)
+    except Exception as e:
+        db.log_error(f"Error loading subtask: {e}")
+        return None
+
+
+def load_project_members(project_id: int, user_id: Optional[int] = None) -> List[MemberRow]:
+    """Members with usernames, in join order; [] if the user is not a member."""
+    try:
+        if user_id and user_id not in db.get_project_roles(project_id):
+            return []
+        with db.SessionLocal() as session:
+            rows = session.execute(
+                select(ProjectMember.user_id, ProjectMember.role)
+                .where(ProjectMember.project_id == project_id).order_by(ProjectMember.joined_at)
+            ).all()
+            names = _usernames(session, [r.user_id for r in rows])
+        return [MemberRow(r.user_id, names.get(r.user_id, ""), r.role) for r in rows]
+    except Exception as e:
+        db.log_error(f"Error loading project members: {e}")
+        return []
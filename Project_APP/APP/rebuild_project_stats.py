@@ -0,0 +1,13 @@
+# rebuild_project_stats.py: recompute the project_stats counters from tasks, subtasks and members.
+#
+#   python -m Project_APP.APP.rebuild_project_stats            # every project
+#   python -m Project_APP.APP.rebuild_project_stats 12         # one project
+
+import sys
+
+from Project_APP.APP.db import rebuild_project_stats
+
+if __name__ == "__main__":
+    project_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    count = rebuild_project_stats(project_id)
+    print(f"Rebuilt statistics for {count} project(s).")
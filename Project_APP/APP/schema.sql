@@ -159,4 +159,48 @@ CREATE TABLE IF NOT EXISTS file_versions (
     author TEXT,
     FOREIGN KEY (file_id) REFERENCES files(id) ON DELETE CASCADE,
     FOREIGN KEY (repo_id) REFERENCES github_repos(id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+-- Indexes for hot lookups (mirrors the Index / index=True declarations in db.py)
+CREATE INDEX IF NOT EXISTS ix_tasks_project_id ON tasks(project_id);
+CREATE INDEX IF NOT EXISTS ix_tasks_assigned_to ON tasks(assigned_to);
+CREATE INDEX IF NOT EXISTS ix_subtasks_task_id ON subtasks(task_id);
+CREATE INDEX IF NOT EXISTS ix_subtasks_assigned_to ON subtasks(assigned_to);
+CREATE INDEX IF NOT EXISTS ix_project_members_user_id ON project_members(user_id);
+CREATE INDEX IF NOT EXISTS ix_files_project_id ON files(project_id);
+CREATE INDEX IF NOT EXISTS ix_event_logs_project_user_timestamp ON event_logs(project_id, user_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_event_logs_user_timestamp ON event_logs(user_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_event_logs_type_timestamp ON event_logs(event_type, timestamp);
+CREATE INDEX IF NOT EXISTS ix_messages_recipient_timestamp ON messages(recipient_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+CREATE INDEX IF NOT EXISTS ix_eisenhower_matrix_states_project_user ON eisenhower_matrix_states(project_id, user_id);
+-- Dependency graph: one row per edge "node depends on depends_on" (task or subtask nodes)
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    node_type TEXT NOT NULL,
+    node_id INTEGER NOT NULL,
+    depends_on_type TEXT NOT NULL,
+    depends_on_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (node_type, node_id, depends_on_type, depends_on_id),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_task_dependencies_reverse ON task_dependencies(depends_on_type, depends_on_id);
+CREATE INDEX IF NOT EXISTS ix_task_dependencies_project ON task_dependencies(project_id);
+-- Per-project statistics counters maintained by db.py (rebuild with rebuild_project_stats.py)
+CREATE TABLE IF NOT EXISTS project_stats (
+    project_id INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, metric, key),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+-- Daily event counts kept after event_retention.py archives the event_logs rows
+CREATE TABLE IF NOT EXISTS event_log_rollups (
+    day DATE NOT NULL,
+    event_type TEXT NOT NULL,
+    project_id INTEGER NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, event_type, project_id)
+);
+CREATE INDEX IF NOT EXISTS ix_event_log_rollups_project_day ON event_log_rollups(project_id, day);
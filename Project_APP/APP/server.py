@@ -1,22 +1,85 @@
-import sqlite3
-from flask import Flask, request, jsonify
-from Draft_2.app.db import (
+from datetime import datetime
+from flask import Flask, g, request, jsonify
+from sqlalchemy import select
+from Project_APP.APP.db import (
     create_task as orm_create_task,
+    update_task as orm_update_task,
     get_task_by_id,
     get_project_by_id,
-    get_user_by_id,
-    log_structured_event,
+    create_event as orm_create_event,
+    get_event as orm_get_event,
+    get_user_events,
+    update_event as orm_update_event,
+    delete_event as orm_delete_event,
+    update_event_invitees,
+    respond_to_event,
     SessionLocal,
+    Task,
+    search as db_search,
+    TENANT_DB_DIR,
+    get_user_by_id,
+    tenant_engine,
+    tenant_scope,
 )
-from Draft_2.app.backend.tiny_llama import TinyLlamaPlanner
+from Project_APP.APP.backend.model_router import SPRINT_PLAN, TIME_SUGGESTION, get_router
 
 app = Flask(__name__)
-DB_PATH = "Draft_2/app/auth.db"
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Writes go through the db.py helpers, so project statistics, the read cache and dependency
+# edges stay current; plain listings read with SQLAlchemy Core
+tasks_table = Task.__table__
+
+# --- Tenant routing ---
+
+# Every request runs against the caller's tenant database: the tenant of the user_id in the query
+# string or JSON body (owner_id / creator_id for creates). Resource ids are only unique within a
+# tenant, so with per-tenant databases (TENANT_DB_DIR) a request without a known caller is
+# rejected rather than run against the main database.
+CALLER_KEYS = ("user_id", "owner_id", "creator_id")
+
+def _caller_id():
+    body = request.get_json(silent=True)
+    for key in CALLER_KEYS:
+        value = request.args.get(key, type=int)
+        if value is None and isinstance(body, dict):
+            value = body.get(key)
+        if value:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+@app.before_request
+def _enter_tenant_scope():
+    caller = _caller_id()
+    user = get_user_by_id(caller) if caller is not None else None
+    if TENANT_DB_DIR and user is None:
+        return jsonify({"error": "user_id of an existing user required"}), 400
+    if caller is not None:
+        g.tenant_scope = tenant_scope(user.tenant_id if user is not None else None)
+        g.tenant_scope.__enter__()
+
+@app.teardown_request
+def _exit_tenant_scope(exc):
+    scope = g.pop("tenant_scope", None)
+    if scope is not None:
+        scope.__exit__(None, None, None)
+
+def parse_datetime(value):
+    """ISO 8601 string from a request body -> datetime (None passes through)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+def _serializable(values):
+    return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in values.items()}
+
+def _task_values(task):
+    """Column values of a Task object or a tasks row."""
+    if isinstance(task, Task):
+        return {column.name: getattr(task, column.name) for column in tasks_table.columns}
+    return dict(task._mapping)
 
 @app.route("/tasks", methods=["POST"])
 def create_task():
@@ -25,107 +88,77 @@ def create_task():
         return jsonify({"error": "Missing JSON body"}), 400
     project_id = data.get("project_id")
     title = data.get("title")
-    description = data.get("description")
-    status = data.get("status", "pending")
-    assigned_to = data.get("assigned_to")
-    deadline = data.get("deadline")  # ISO 8601 string expected
-
     if not project_id or not title:
         return jsonify({"error": "project_id and title are required"}), 400
-
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO tasks (project_id, title, description, status, assigned_to, due_date)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (project_id, title, description, status, assigned_to, deadline)
+    try:
+        deadline = parse_datetime(data.get("deadline"))  # ISO 8601 string expected
+    except ValueError:
+        return jsonify({"error": "deadline must be an ISO 8601 date"}), 400
+
+    created = orm_create_task(
+        project_id=project_id,
+        title=title,
+        description=data.get("description"),
+        assigned_to=data.get("assigned_to"),
+        due_date=deadline,
+        hours=data.get("hours"),
+        dependencies=data.get("dependencies"),
+        status=data.get("status", "pending"),
     )
-    task_id = cur.lastrowid
-    conn.commit()
-    cur.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-    row = cur.fetchone()
-    conn.close()
-    return jsonify(task_row_to_dict(row)), 201
+    if not created:
+        return jsonify({"error": "Task creation failed"}), 500
+    return jsonify(task_row_to_dict(get_task_by_id(created["id"]))), 201
 
 @app.route("/tasks/<int:task_id>", methods=["PUT"])
 def update_task(task_id):
     data = request.json
-    fields = []
-    values = []
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
-    for key in ["title", "description", "status", "assigned_to", "deadline"]:
+    values = {}
+    for key in ["title", "description", "status", "assigned_to", "deadline", "hours", "dependencies"]:
         if key in data:
-            db_key = "due_date" if key == "deadline" else key
-            fields.append(f"{db_key} = ?")
-            values.append(data[key])
-    if not fields:
+            values["due_date" if key == "deadline" else key] = data[key]
+    if not values:
         return jsonify({"error": "No fields to update"}), 400
-    values.append(task_id)
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        f"UPDATE tasks SET {', '.join(fields)} WHERE id = ?",
-        values
-    )
-    conn.commit()
-    cur.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-    row = cur.fetchone()
-    conn.close()
-    if row:
-        return jsonify(task_row_to_dict(row))
-    else:
+    try:
+        if "due_date" in values:
+            values["due_date"] = parse_datetime(values["due_date"])
+    except ValueError:
+        return jsonify({"error": "deadline must be an ISO 8601 date"}), 400
+    if get_task_by_id(task_id) is None:
         return jsonify({"error": "Task not found"}), 404
+    if orm_update_task(task_id, **values) is None:
+        return jsonify({"error": "Task update failed"}), 400
+    return jsonify(task_row_to_dict(get_task_by_id(task_id)))
 
 @app.route("/tasks/<int:task_id>", methods=["GET"])
 def get_task(task_id):
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-    row = cur.fetchone()
-    conn.close()
-    if row:
-        return jsonify(task_row_to_dict(row))
+    task = get_task_by_id(task_id)
+    if task:
+        return jsonify(task_row_to_dict(task))
     else:
         return jsonify({"error": "Task not found"}), 404
 
 @app.route("/tasks", methods=["GET"])
 def list_tasks():
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM tasks")
-    rows = cur.fetchall()
-    conn.close()
+    with tenant_engine().connect() as conn:
+        rows = conn.execute(select(tasks_table)).all()
     return jsonify([task_row_to_dict(row) for row in rows])
 
-def task_row_to_dict(row):
-    if not row:
+def task_row_to_dict(task):
+    if not task:
         return None
-    d = dict(row)
+    d = _serializable(_task_values(task))
     # Map due_date to deadline in API
     d["deadline"] = d.pop("due_date", None)
     return d
 
 # --- Calendar Event Endpoints ---
 
-def event_row_to_dict(row):
-    if not row:
-        return None
-    d = dict(row)
-    d["start_datetime"] = d.get("start_datetime")
-    d["end_datetime"] = d.get("end_datetime")
-    d["creator_id"] = d.get("creator_id")
-    return d
-
-def invitee_row_to_dict(row):
-    if not row:
+def event_row_to_dict(event):
+    if not event:
         return None
-    return {
-        "user_id": row["user_id"],
-        "status": row["status"]
-    }
+    return _serializable(event)
 
 @app.route("/events", methods=["POST"])
 def create_event():
@@ -141,106 +174,57 @@ def create_event():
 
     if not (title and start_datetime and end_datetime and creator_id):
         return jsonify({"error": "Missing required fields"}), 400
+    try:
+        start_datetime, end_datetime = parse_datetime(start_datetime), parse_datetime(end_datetime)
+    except ValueError:
+        return jsonify({"error": "start_datetime and end_datetime must be ISO 8601"}), 400
 
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO events (title, description, start_datetime, end_datetime, creator_id, created_at)
-        VALUES (?, ?, ?, ?, ?, datetime('now'))
-        """,
-        (title, description, start_datetime, end_datetime, creator_id)
-    )
-    event_id = cur.lastrowid
-
-    for user_id in invitees:
-        cur.execute(
-            "INSERT INTO event_invitees (event_id, user_id, status) VALUES (?, ?, ?)",
-            (event_id, user_id, "pending")
-        )
-    conn.commit()
-    cur.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-    row = cur.fetchone()
-    conn.close()
-    return jsonify(event_row_to_dict(row)), 201
+    event = orm_create_event(title, description, start_datetime, end_datetime, creator_id, invitees)
+    if event is None:
+        return jsonify({"error": "Event creation failed"}), 500
+    return jsonify(event_row_to_dict(event)), 201
 
 @app.route("/events", methods=["GET"])
 def list_events():
-    user_id = request.args.get("user_id")
+    user_id = request.args.get("user_id", type=int)
     if not user_id:
         return jsonify({"error": "user_id required"}), 400
-    conn = get_db()
-    cur = conn.cursor()
     # Events created by user or where user is invited
-    cur.execute("""
-        SELECT DISTINCT e.*
-        FROM events e
-        LEFT JOIN event_invitees ei ON e.id = ei.event_id
-        WHERE e.creator_id = ? OR ei.user_id = ?
-    """, (user_id, user_id))
-    rows = cur.fetchall()
-    conn.close()
-    return jsonify([event_row_to_dict(row) for row in rows])
+    return jsonify([event_row_to_dict(event) for event in get_user_events(user_id)])
 
 @app.route("/events/<int:event_id>", methods=["GET"])
 def get_event(event_id):
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
+    event = orm_get_event(event_id)
+    if not event:
         return jsonify({"error": "Event not found"}), 404
-    cur.execute("SELECT user_id, status FROM event_invitees WHERE event_id = ?", (event_id,))
-    invitees = [invitee_row_to_dict(r) for r in cur.fetchall()]
-    conn.close()
-    event = event_row_to_dict(row)
-    if event is not None:
-        event["invitees"] = invitees
-    return jsonify(event)
+    return jsonify(event_row_to_dict(event))
 
 @app.route("/events/<int:event_id>", methods=["PUT"])
 def update_event(event_id):
     data = request.json
-    fields = []
-    values = []
+    values = {}
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
     for key in ["title", "description", "start_datetime", "end_datetime"]:
         if key in data:
-            fields.append(f"{key} = ?")
-            values.append(data[key])
-    if not fields:
+            values[key] = data[key]
+    if not values:
         return jsonify({"error": "No fields to update"}), 400
-    values.append(event_id)
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        f"UPDATE events SET {', '.join(fields)} WHERE id = ?",
-        values
-    )
+    try:
+        for key in ("start_datetime", "end_datetime"):
+            if key in values:
+                values[key] = parse_datetime(values[key])
+    except ValueError:
+        return jsonify({"error": "start_datetime and end_datetime must be ISO 8601"}), 400
     # Optionally update invitees
-    if data and "invitees" in data:
-        cur.execute("DELETE FROM event_invitees WHERE event_id = ?", (event_id,))
-        for user_id in data["invitees"]:
-            cur.execute(
-                "INSERT INTO event_invitees (event_id, user_id, status) VALUES (?, ?, ?)",
-                (event_id, user_id, "pending")
-            )
-    conn.commit()
-    cur.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-    row = cur.fetchone()
-    conn.close()
-    return jsonify(event_row_to_dict(row))
+    event = orm_update_event(event_id, invitees=data.get("invitees"), **values)
+    if event is None:
+        return jsonify({"error": "Event not found"}), 404
+    return jsonify(event_row_to_dict(event))
 
 @app.route("/events/<int:event_id>", methods=["DELETE"])
 def delete_event(event_id):
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM event_invitees WHERE event_id = ?", (event_id,))
-    cur.execute("DELETE FROM events WHERE id = ?", (event_id,))
-    conn.commit()
-    conn.close()
+    orm_delete_event(event_id)
     return jsonify({"success": True})
 
 @app.route("/events/<int:event_id>/invitees", methods=["POST"])
@@ -248,24 +232,9 @@ def manage_invitees(event_id):
     data = request.json
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
-    add = data.get("add", [])
-    remove = data.get("remove", [])
-    conn = get_db()
-    cur = conn.cursor()
-    for user_id in add:
-        cur.execute(
-            "INSERT OR IGNORE INTO event_invitees (event_id, user_id, status) VALUES (?, ?, ?)",
-            (event_id, user_id, "pending")
-        )
-    for user_id in remove:
-        cur.execute(
-            "DELETE FROM event_invitees WHERE event_id = ? AND user_id = ?",
-            (event_id, user_id)
-        )
-    conn.commit()
-    cur.execute("SELECT user_id, status FROM event_invitees WHERE event_id = ?", (event_id,))
-    invitees = [invitee_row_to_dict(r) for r in cur.fetchall()]
-    conn.close()
+    invitees = update_event_invitees(event_id, add=data.get("add", []), remove=data.get("remove", []))
+    if invitees is None:
+        return jsonify({"error": "Updating invitees failed"}), 500
     return jsonify({"invitees": invitees})
 
 @app.route("/events/<int:event_id>/respond", methods=["POST"])
@@ -277,16 +246,9 @@ def respond_invitation(event_id):
     status = data.get("status")  # "accepted" or "declined"
     if not (user_id and status in ("accepted", "declined")):
         return jsonify({"error": "user_id and valid status required"}), 400
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE event_invitees SET status = ? WHERE event_id = ? AND user_id = ?",
-        (status, event_id, user_id)
-    )
-    conn.commit()
-    cur.execute("SELECT user_id, status FROM event_invitees WHERE event_id = ?", (event_id,))
-    invitees = [invitee_row_to_dict(r) for r in cur.fetchall()]
-    conn.close()
+    invitees = respond_to_event(event_id, user_id, status)
+    if invitees is None:
+        return jsonify({"error": "Recording the response failed"}), 500
     return jsonify({"invitees": invitees})
 
 @app.route("/plan/generate", methods=["POST"])
@@ -298,7 +260,9 @@ def generate_project_plan():
     user_id = data.get("user_id")
     if not project_id or not user_id:
         return jsonify({"error": "project_id and user_id required"}), 400
-    planner = TinyLlamaPlanner(user_id=user_id)
+    planner = get_router().planner_for(SPRINT_PLAN, "generate_project_plan", latency_slo=data.get("latency_slo"))
+    if planner is None:
+        return jsonify({"error": "No model supports plan generation"}), 501
     plan = planner.generate_project_plan(project_id)
     if plan is None:
         return jsonify({"error": "Plan generation failed"}), 500
@@ -324,7 +288,9 @@ def suggest_time_for_task():
         if not project:
             return jsonify({"error": "Project not found"}), 404
         team_members = session.query(ProjectMember).filter_by(project_id=project.id).all()
-        planner = TinyLlamaPlanner(user_id=user_id)
+        planner = get_router().planner_for(TIME_SUGGESTION, "suggest_time_for_task", latency_slo=data.get("latency_slo"))
+        if planner is None:
+            return jsonify({"error": "No model supports time suggestions"}), 501
         suggestion = planner.suggest_time_for_task(task, project, team_members)
     return jsonify({"suggestion": suggestion})
 
@@ -337,13 +303,15 @@ def verify_plan():
     user_id = data.get("user_id")
     if not plan or not user_id:
         return jsonify({"error": "plan and user_id required"}), 400
-    planner = TinyLlamaPlanner(user_id=user_id)
+    planner = get_router().planner_for(SPRINT_PLAN, "verify_plan_feasibility", latency_slo=data.get("latency_slo"))
+    if planner is None:
+        return jsonify({"error": "No model supports plan verification"}), 501
     result = planner.verify_plan_feasibility(plan)
     return jsonify(result)
 
 # --- Project Management Endpoints ---
 
-from Draft_2.app.db import (
+from Project_APP.APP.db import (
     create_project as orm_create_project,
     update_project as orm_update_project,
     get_project_by_id as orm_get_project_by_id,
@@ -453,5 +421,28 @@ def remove_project_member(project_id, member_id):
         return jsonify({"error": error}), 403
     return jsonify({"success": True})
 
+@app.route("/search", methods=["GET"])
+def search():
+    """Full-text search scoped to the user's projects: /search?user_id=1&q=landing&kind=task&limit=20&offset=0"""
+    user_id = request.args.get("user_id", type=int)
+    query = request.args.get("q", "")
+    if not user_id or not query.strip():
+        return jsonify({"error": "user_id and q are required"}), 400
+    limit = min(request.args.get("limit", 20, type=int), 100)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    results, next_offset = db_search(
+        user_id,
+        query,
+        kinds=request.args.getlist("kind") or None,
+        project_id=request.args.get("project_id", type=int),
+        limit=limit,
+        offset=offset,
+    )
+    return jsonify({"results": results, "next_offset": next_offset})
+
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # Preload models in the background so the first plan request is not a cold start
+    from Project_APP.APP.backend.model_manager import get_model_manager
+    get_model_manager().start()
+    # The reloader re-runs this module in a child process, which would preload everything twice
+    app.run(debug=True, use_reloader=False)
\ No newline at end of file
@@ -0,0 +1,95 @@
+# split_tenants.py: move each tenant's rows out of the main database into its own tenant database.
+#
+# Requires TENANT_DB_DIR (the directory db.py routes tenant databases to). Every tenant table is
+# copied row by row with its ids. A project belongs to its tenant_id; projects that never had
+# one are first given their owner's tenant. Rows are deleted from the main database only after
+# every copy for that tenant has committed. Re-running after an interruption skips rows already
+# copied. Catalog tables (users, tenants, roles, tokens) stay where they are. Run it while the
+# app is stopped.
+#
+#   TENANT_DB_DIR=/srv/tenants python -m Project_APP.APP.split_tenants             # every tenant
+#   TENANT_DB_DIR=/srv/tenants python -m Project_APP.APP.split_tenants 3 7         # tenants 3 and 7
+#   TENANT_DB_DIR=/srv/tenants python -m Project_APP.APP.split_tenants --keep      # copy, keep originals
+
+import sys
+
+from sqlalchemy import and_, insert, or_, select, update
+
+from Project_APP.APP import db
+from Project_APP.APP.db import Event, File, Project, Task, Tenant, User
+
+CHUNK_SIZE = 1000
+
+
+def backfill_project_tenants():
+    """Give projects without a tenant_id their owner's tenant; returns the number of rows filled."""
+    owner_tenant = select(User.tenant_id).where(User.id == Project.owner_id).scalar_subquery()
+    with db.engine.begin() as conn:
+        return conn.execute(
+            update(Project).where(Project.tenant_id.is_(None)).values(tenant_id=owner_tenant)
+        ).rowcount
+
+
+def _ownership(tenant_id):
+    """{table name: WHERE clause selecting the tenant's rows of that table in the main database}."""
+    projects = select(Project.id).where(Project.tenant_id == tenant_id)
+    users = select(User.id).where(User.tenant_id == tenant_id)
+    tables = {t.name: t for t in db.tenant_tables()}
+    where = {
+        "projects": Project.tenant_id == tenant_id,
+        "subtasks": tables["subtasks"].c.task_id.in_(select(Task.id).where(Task.project_id.in_(projects))),
+        "file_versions": tables["file_versions"].c.file_id.in_(select(File.id).where(File.project_id.in_(projects))),
+        "messages": tables["messages"].c.sender_id.in_(users),
+        "events": tables["events"].c.creator_id.in_(users),
+        "event_invitees": tables["event_invitees"].c.event_id.in_(select(Event.id).where(Event.creator_id.in_(users))),
+        "event_logs": or_(
+            tables["event_logs"].c.project_id.in_(projects),
+            and_(tables["event_logs"].c.project_id.is_(None), tables["event_logs"].c.user_id.in_(users)),
+        ),
+    }
+    for name, table in tables.items():
+        if name not in where and "project_id" in table.c:
+            where[name] = table.c.project_id.in_(projects)
+    return where
+
+
+def split_tenant(tenant_id, keep=False):
+    """Copy (and unless keep, then delete) one tenant's rows. Returns {table: rows copied}."""
+    backfill_project_tenants()  # projects created before create_project recorded the tenant
+    where = _ownership(tenant_id)
+    tables = db.tenant_tables()
+    missing = [t.name for t in tables if t.name not in where]
+    if missing:
+        db.log_error(f"split_tenants: no ownership rule for {', '.join(missing)}; rows left in the main database")
+    target = db.tenant_engine(tenant_id)
+    copied = {}
+    with db.engine.connect() as source:
+        for table in tables:  # parents before children
+            if table.name not in where:
+                continue
+            result = source.execution_options(yield_per=CHUNK_SIZE).execute(select(table).where(where[table.name]))
+            count = 0
+            for rows in result.partitions():
+                with target.begin() as conn:
+                    conn.execute(insert(table).prefix_with("OR IGNORE"), [dict(r._mapping) for r in rows])
+                count += len(rows)
+            copied[table.name] = count
+    if not keep:
+        with db.engine.begin() as conn:
+            for table in reversed(tables):  # children before the parents their rules select through
+                if table.name in where:
+                    conn.execute(table.delete().where(where[table.name]))
+    db.log_event(f"Split tenant {tenant_id} into {db.tenant_db_path(tenant_id)}: {copied}")
+    return copied
+
+
+if __name__ == "__main__":
+    if not db.TENANT_DB_DIR:
+        sys.exit("Set TENANT_DB_DIR to the directory for the tenant databases.")
+    keep = "--keep" in sys.argv
+    requested = [int(a) for a in sys.argv[1:] if a.isdigit()]
+    with db.SessionLocal() as session:
+        tenant_ids = requested or list(session.scalars(select(Tenant.id).order_by(Tenant.id)))
+    for tenant_id in tenant_ids:
+        copied = split_tenant(tenant_id, keep=keep)
+        print(f"tenant {tenant_id}: {sum(copied.values())} row(s) -> {db.tenant_db_path(tenant_id)}")
@@ -0,0 +1,126 @@
+import csv
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+###############################
+# Setup
+###############################
+
+# Run from anywhere: make the repository root importable and keep db.py off the real auth.db
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, REPO_ROOT)
+TMP_DIR = tempfile.mkdtemp(prefix="sqlite_bench_")
+os.environ.setdefault("AUTH_DB_PATH", os.path.join(TMP_DIR, "import_only.db"))
+
+from Project_APP.APP.db import SQLITE_PROFILES, apply_sqlite_pragmas
+
+DURATION_S = float(os.getenv("BENCH_DURATION", "5"))
+READERS = int(os.getenv("BENCH_READERS", "4"))
+WRITERS = int(os.getenv("BENCH_WRITERS", "2"))
+SEED_ROWS = 20000
+OUTPUT_CSV = os.path.join(os.path.dirname(__file__), "Test_Results", "sqlite_profile_benchmark.csv")
+
+###############################
+# Workload
+###############################
+
+def connect(path, profile):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    apply_sqlite_pragmas(conn, profile)
+    return conn
+
+def seed(path, profile):
+    conn = connect(path, profile)
+    conn.execute(
+        "CREATE TABLE event_logs (id INTEGER PRIMARY KEY, project_id INTEGER, user_id INTEGER, "
+        "event_type TEXT, reasoning TEXT, timestamp REAL)"
+    )
+    conn.execute("CREATE INDEX ix_event_logs_project_ts ON event_logs(project_id, timestamp)")
+    conn.executemany(
+        "INSERT INTO event_logs (project_id, user_id, event_type, reasoning, timestamp) VALUES (?, ?, ?, ?, ?)",
+        [(i % 50, i % 20, "recategorization", "seed row " * 5, time.time()) for i in range(SEED_ROWS)],
+    )
+    conn.commit()
+    conn.close()
+
+def reader(path, profile, stop, counts, errors):
+    conn = connect(path, profile)
+    n = 0
+    while not stop.is_set():
+        try:
+            conn.execute(
+                "SELECT * FROM event_logs WHERE project_id = ? ORDER BY timestamp DESC LIMIT 50", (n % 50,)
+            ).fetchall()
+            n += 1
+        except sqlite3.OperationalError:
+            errors.append(1)
+    conn.close()
+    counts.append(n)
+
+def writer(path, profile, stop, counts, errors):
+    conn = connect(path, profile)
+    n = 0
+    while not stop.is_set():
+        try:
+            conn.execute(
+                "INSERT INTO event_logs (project_id, user_id, event_type, reasoning, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (n % 50, n % 20, "llm_suggestion", "benchmark write", time.time()),
+            )
+            conn.commit()  # one transaction per event, like EVENT_LOG_DURABILITY=sync
+            n += 1
+        except sqlite3.OperationalError:
+            conn.rollback()
+            errors.append(1)
+    conn.close()
+    counts.append(n)
+
+def run_profile(profile):
+    path = os.path.join(TMP_DIR, f"{profile}.db")
+    seed(path, profile)
+    stop = threading.Event()
+    reads, writes, errors = [], [], []
+    threads = [threading.Thread(target=reader, args=(path, profile, stop, reads, errors)) for _ in range(READERS)]
+    threads += [threading.Thread(target=writer, args=(path, profile, stop, writes, errors)) for _ in range(WRITERS)]
+    for t in threads:
+        t.start()
+    time.sleep(DURATION_S)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {
+        "profile": profile,
+        "readers": READERS,
+        "writers": WRITERS,
+        "duration_s": DURATION_S,
+        "reads_per_s": round(sum(reads) / DURATION_S, 1),
+        "writes_per_s": round(sum(writes) / DURATION_S, 1),
+        "lock_errors": len(errors),
+    }
+
+###############################
+# Main
+###############################
+
+def main():
+    results = []
+    for profile in SQLITE_PROFILES:
+        print(f"[INFO] Running profile '{profile}' for {DURATION_S}s ({READERS} readers, {WRITERS} writers)...")
+        result = run_profile(profile)
+        print(f"[RESULT] {result}")
+        results.append(result)
+
+    os.makedirs(os.path.dirname(OUTPUT_CSV), exist_ok=True)
+    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        w.writeheader()
+        w.writerows(results)
+    print(f"[INFO] Results written to {OUTPUT_CSV}")
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()